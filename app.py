@@ -1,25 +1,121 @@
 """CDK application entry point."""
 
+import dataclasses
+import hashlib
+import json
 import os
 import sys
+import tempfile
+import traceback
 from pathlib import Path
 
 # Add project root to path
-sys.path.insert(0, str(Path(__file__).parent))
+PROJECT_ROOT = Path(__file__).parent
+sys.path.insert(0, str(PROJECT_ROOT))
 
-import aws_cdk as cdk
-from infrastructure.stacks.data_pipeline_stack import DataPipelineStack
+from infrastructure import daemon
 from infrastructure.config.settings import PipelineSettings
 
+# Inputs that change the synthesized cloud assembly
+SOURCE_DIRS = ("infrastructure", "lambdas")
+SOURCE_FILES = ("app.py", "cdk.json")
+FINGERPRINT_FILE = ".fingerprint"
 
-def main():
-    """Main entry point for CDK application."""
+# Build the constructs without writing a cloud assembly (e.g. for pre-commit hooks)
+NO_SYNTH_ENV = "CDK_NO_SYNTH"
+NO_SYNTH_FLAG = "--no-synth"
+
+# Context that turns off Docker asset bundling for every stack
+NO_BUNDLING_CONTEXT = {"aws:cdk:bundling-stacks": []}
+
+
+def source_fingerprint() -> str:
+    """Hash path, size and mtime of every source file (no file reads)."""
+    digest = hashlib.blake2b(digest_size=16)
+    pending = [PROJECT_ROOT / name for name in SOURCE_DIRS]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if entry.name == "__pycache__":
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(Path(entry.path))
+                    continue
+                stat = entry.stat()
+                digest.update(f"{entry.path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+
+    for name in SOURCE_FILES:
+        stat = (PROJECT_ROOT / name).stat()
+        digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+
+    return digest.hexdigest()
+
+
+def settings_values(settings: PipelineSettings) -> dict:
+    """JSON-serializable view of the user-facing settings fields."""
+    return {f.name: getattr(settings, f.name) for f in dataclasses.fields(settings) if f.init}
+
+
+def compute_fingerprint(settings: PipelineSettings, source_hash: str) -> str:
+    """Fingerprint the settings, CDK environment and source tree used for synthesis."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(settings_values(settings), sort_keys=True).encode())
+    digest.update(json.dumps(daemon.cli_context(os.environ), sort_keys=True).encode())
+    cdk_env = {key: value for key, value in os.environ.items() if key.startswith("CDK_")}
+    digest.update(json.dumps(cdk_env, sort_keys=True).encode())
+    digest.update(source_hash.encode())
+    return digest.hexdigest()
 
-    # Load settings
-    settings = PipelineSettings()
+
+def is_synth_cached(outdir: str, fingerprint: str) -> bool:
+    """Check whether ``outdir`` already holds a cloud assembly for ``fingerprint``."""
+    if os.environ.get("CDK_FORCE_SYNTH") == "1":
+        return False
+
+    out_path = Path(outdir)
+    try:
+        cached = (out_path / FINGERPRINT_FILE).read_text(encoding="utf-8")
+    except OSError:
+        return False
+
+    return cached == fingerprint and (out_path / "manifest.json").exists()
+
+
+def write_fingerprint(outdir: str, fingerprint: str) -> None:
+    """Atomically record the fingerprint of a freshly synthesized assembly."""
+    target = Path(outdir) / FINGERPRINT_FILE
+    tmp = target.with_suffix(".tmp")
+    tmp.write_text(fingerprint, encoding="utf-8")
+    os.replace(tmp, target)
+
+
+def build_app(
+        settings: PipelineSettings,
+        outdir: str = None,
+        context: dict = None,
+        skip_bundling: bool = False
+):
+    """
+    Build the pipeline app without synthesizing it.
+
+    Args:
+        settings: Pipeline settings
+        outdir: Cloud assembly directory; read from the CDK CLI environment if omitted
+        context: CDK context; read from the CDK CLI environment if omitted
+        skip_bundling: Skip Docker asset bundling, even if the CDK CLI requested it
+
+    Returns:
+        CDK app containing the pipeline stack
+    """
+    # aws_cdk and the stack modules are only imported once the app is built
+    import aws_cdk as cdk
 
     # Create CDK app
-    app = cdk.App()
+    app = cdk.App(
+        outdir=outdir,
+        context=context,
+        post_cli_context=NO_BUNDLING_CONTEXT if skip_bundling else None
+    )
 
     # Add context values
     app.node.set_context("environment", settings.environment)
@@ -36,6 +132,8 @@ def main():
     )
 
     # Create main pipeline stack
+    from infrastructure.stacks.data_pipeline_stack import DataPipelineStack
+
     DataPipelineStack(
         app,
         f"DataPipelineStack-{settings.environment}",
@@ -45,9 +143,97 @@ def main():
         stack_name=f"data-pipeline-{settings.environment}"
     )
 
-    # Synthesize
-    app.synth()
+    return app
+
+
+def synthesize(settings: PipelineSettings, outdir: str = None, context: dict = None) -> str:
+    """
+    Build the pipeline app and synthesize it.
+
+    Args:
+        settings: Pipeline settings
+        outdir: Cloud assembly directory; read from the CDK CLI environment if omitted
+        context: CDK context; read from the CDK CLI environment if omitted
+
+    Returns:
+        Cloud assembly directory
+    """
+    return build_app(settings, outdir, context).synth().directory
+
+
+def _daemon_synth(request: dict) -> str:
+    """Synthesize a request received by the synth daemon."""
+    environ = request["environ"]
+    os.environ.clear()
+    os.environ.update(environ)
+
+    values = dict(request["settings"])
+    values["partition_keys"] = tuple(values["partition_keys"])
+
+    return synthesize(
+        PipelineSettings(**values),
+        outdir=environ["CDK_OUTDIR"],
+        context=daemon.cli_context(environ)
+    )
+
+
+def serve_daemon() -> None:
+    """Run the synth daemon with aws_cdk and the stacks already imported."""
+    source_hash = source_fingerprint()
+
+    # Warm up the jsii runtime with a throwaway synth so the first request is fast.
+    # A failure here (bad settings, failed lookup) would fail every request too,
+    # so exit and leave synthesis to the in-process fallback, which reports it.
+    with tempfile.TemporaryDirectory() as warmup_dir:
+        try:
+            synthesize(PipelineSettings(), outdir=warmup_dir, context=NO_BUNDLING_CONTEXT)
+        except Exception:
+            print("Synth daemon warm-up failed:", file=sys.stderr)
+            traceback.print_exc()
+            sys.exit(1)
+
+    daemon.serve(PROJECT_ROOT, source_hash, _daemon_synth)
+
+
+def main():
+    """Main entry point for CDK application."""
+
+    # Load settings
+    settings = PipelineSettings()
+
+    # Validate the stack code only; nothing is written to cdk.out
+    if os.environ.get(NO_SYNTH_ENV) == "1" or NO_SYNTH_FLAG in sys.argv:
+        build_app(settings, skip_bundling=True)
+        print("parse-ok")
+        return
+
+    # Reuse the previous cloud assembly when nothing that feeds synthesis changed.
+    # CDK_OUTDIR is only set by the CDK CLI; standalone runs synthesize to a temp dir.
+    outdir = os.environ.get("CDK_OUTDIR")
+    source_hash = source_fingerprint()
+    fingerprint = compute_fingerprint(settings, source_hash)
+    if outdir and is_synth_cached(outdir, fingerprint):
+        return
+
+    # Optionally hand synthesis to a warm daemon, starting one for next time if needed
+    directory = None
+    if outdir and daemon.is_enabled():
+        directory = daemon.request_synth(PROJECT_ROOT, {
+            "source_hash": source_hash,
+            "settings": settings_values(settings),
+            "environ": dict(os.environ)
+        })
+        if directory is None:
+            daemon.spawn(Path(__file__).resolve())
+
+    if directory is None:
+        directory = synthesize(settings)
+
+    write_fingerprint(directory, fingerprint)
 
 
 if __name__ == "__main__":
-    main()
+    if daemon.DAEMON_FLAG in sys.argv:
+        serve_daemon()
+    else:
+        main()
@@ -1,34 +1,37 @@
 """Constants for the data pipeline."""
 
-from enum import Enum
+from types import MappingProxyType
+from typing import Final, Mapping
 
 
-class DataFormat(str, Enum):
+# Plain string namespaces rather than Enums: the values are only used as
+# string constants, and Enum class creation is comparatively slow at import.
+class DataFormat:
     """Supported data formats."""
-    PARQUET = "parquet"
-    CSV = "csv"
-    JSON = "json"
-    AVRO = "avro"
+    PARQUET: Final = "parquet"
+    CSV: Final = "csv"
+    JSON: Final = "json"
+    AVRO: Final = "avro"
 
 
-class CrawlerState(str, Enum):
+class CrawlerState:
     """Glue crawler states."""
-    READY = "READY"
-    RUNNING = "RUNNING"
-    STOPPING = "STOPPING"
+    READY: Final = "READY"
+    RUNNING: Final = "RUNNING"
+    STOPPING: Final = "STOPPING"
 
 
-class LakeFormationPermission(str, Enum):
+class LakeFormationPermission:
     """Lake Formation permissions."""
-    ALL = "ALL"
-    SELECT = "SELECT"
-    ALTER = "ALTER"
-    DROP = "DROP"
-    DELETE = "DELETE"
-    INSERT = "INSERT"
-    CREATE_DATABASE = "CREATE_DATABASE"
-    CREATE_TABLE = "CREATE_TABLE"
-    DATA_LOCATION_ACCESS = "DATA_LOCATION_ACCESS"
+    ALL: Final = "ALL"
+    SELECT: Final = "SELECT"
+    ALTER: Final = "ALTER"
+    DROP: Final = "DROP"
+    DELETE: Final = "DELETE"
+    INSERT: Final = "INSERT"
+    CREATE_DATABASE: Final = "CREATE_DATABASE"
+    CREATE_TABLE: Final = "CREATE_TABLE"
+    DATA_LOCATION_ACCESS: Final = "DATA_LOCATION_ACCESS"
 
 
 # S3 paths
@@ -46,9 +49,9 @@ LAMBDA_LAYER_NAME = "common-utils-layer"
 # Athena configuration
 ATHENA_WORKGROUP = "primary"
 
-# API endpoints (multiple options)
-API_ENDPOINTS = {
+# API endpoints (multiple options); read-only, so callers can share it without copying
+API_ENDPOINTS: Final[Mapping[str, str]] = MappingProxyType({
     "jsonplaceholder": "https://jsonplaceholder.typicode.com/users",
     "randomuser": "https://randomuser.me/api/?results=100",
     "reqres": "https://reqres.in/api/users?page=1&per_page=100"
-}
+})
@@ -1,73 +1,214 @@
 """Configuration settings for the data pipeline."""
 
-from typing import Dict, Optional
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
 
-from pydantic import Field, model_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+ENV_FILE = ".env"
 
+_TRUE_VALUES = frozenset({"1", "true", "t", "yes", "y", "on"})
+_FALSE_VALUES = frozenset({"0", "false", "f", "no", "n", "off"})
 
-class PipelineSettings(BaseSettings):
-    """Pipeline configuration settings."""
+
+@lru_cache(maxsize=None)
+def _read_env_file(path: str = ENV_FILE) -> Dict[str, str]:
+    """
+    Parse a ``.env`` file into a mapping keyed by lower-cased variable name.
+
+    Args:
+        path: Path to the env file
+
+    Returns:
+        Parsed values, or an empty mapping if the file does not exist
+    """
+    values: Dict[str, str] = {}
+    try:
+        with open(path, encoding="utf-8") as env_file:
+            for line in env_file:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if line.startswith("export "):
+                    line = line[len("export "):]
+
+                key, sep, value = line.partition("=")
+                if not sep:
+                    continue
+
+                value = value.strip()
+                if len(value) >= 2 and value[0] == value[-1] and value[0] in ("'", '"'):
+                    value = value[1:-1]
+                values[key.strip().lower()] = value
+    except FileNotFoundError:
+        pass
+
+    return values
+
+
+def _lookup(name: str) -> Optional[str]:
+    """Resolve a setting from the environment, falling back to the ``.env`` file."""
+    for key in (name.upper(), name):
+        if key in os.environ:
+            return os.environ[key]
+    return _read_env_file().get(name)
+
+
+def _to_bool(value: str) -> bool:
+    normalized = value.strip().lower()
+    if normalized in _TRUE_VALUES:
+        return True
+    if normalized in _FALSE_VALUES:
+        return False
+    raise ValueError(f"Invalid boolean value: {value!r}")
+
+
+def _to_tuple(value: str) -> Tuple[str, ...]:
+    value = value.strip()
+    if value.startswith("["):
+        return tuple(json.loads(value))
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+def _env(default: Any, cast: Callable[[str], Any] = str, description: str = "") -> Any:
+    """Declare a setting whose default can be overridden by an environment variable."""
+    return field(default=default, metadata={"cast": cast, "description": description})
+
+
+@dataclass(init=False, slots=True, frozen=True)
+class PipelineSettings:
+    """Pipeline configuration settings.
+
+    Values are resolved in order: keyword arguments, environment variables
+    (case-insensitive), the ``.env`` file, then the defaults below.
+    """
 
     # Environment
-    environment: str = Field(default="dev", description="Development Environment")
-    region: str = Field(default="us-east-1", description="AWS region")
-    account_id: Optional[str] = Field(default=None, description="AWS account ID")
+    environment: str = _env("dev", description="Development Environment")
+    region: str = _env("us-east-1", description="AWS region")
+    account_id: Optional[str] = _env(None, description="AWS account ID")
 
     # Project
-    project_name: str = Field(default="data-pipeline-cdk", description="Project name")
-    owner_tag: str = Field(default="data-engineering", description="Owner tag")
+    project_name: str = _env("data-pipeline-cdk", description="Project name")
+    owner_tag: str = _env("data-engineering", description="Owner tag")
 
     # S3 Configuration
-    data_bucket_name: Optional[str] = Field(default="data-pipeline-cdk-dev-data-bucket", description="S3 bucket name")
-    athena_results_bucket: Optional[str] = Field(default=None)
+    data_bucket_name: Optional[str] = _env("data-pipeline-cdk-dev-data-bucket", description="S3 bucket name")
+    athena_results_bucket: Optional[str] = _env(None)
 
     # Lambda Configuration
-    lambda_timeout: int = Field(default=300, description="Lambda timeout in seconds")
-    lambda_memory: int = Field(default=1024, description="Lambda memory in MB")
-    lambda_runtime: str = Field(default="python3.13", description="Lambda runtime")
+    lambda_timeout: int = _env(300, int, description="Lambda timeout in seconds")
+    lambda_memory: int = _env(1024, int, description="Lambda memory in MB")
+    lambda_runtime: str = _env("python3.13", description="Lambda runtime")
+    enable_snap_start: bool = _env(
+        True,
+        _to_bool,
+        description="Enable Lambda SnapStart; the schedule then invokes a published alias"
+    )
+    compile_data_processor: bool = _env(
+        False,
+        _to_bool,
+        description="Compile the extractor's data_processor with mypyc during bundling (needs arm64 Docker)"
+    )
+    enable_power_tuning: bool = _env(
+        False,
+        _to_bool,
+        description="Deploy the Lambda Power Tuning state machine used to pick lambda_memory"
+    )
+
+    vpc_id: Optional[str] = _env(None, description="VPC to run the extractor in (looked up at synth time)")
+    create_s3_gateway_endpoint: bool = _env(
+        True,
+        _to_bool,
+        description="Add an S3 gateway endpoint to the extractor's VPC; disable if the VPC already has one"
+    )
 
     # API Configuration
-    api_endpoint: str = Field(
-        default="https://jsonplaceholder.typicode.com/users",
+    api_endpoint: str = _env(
+        "https://jsonplaceholder.typicode.com/users",
         description="API endpoint to fetch data from"
     )
-    api_batch_size: int = Field(default=100, description="API batch size")
+    api_batch_size: int = _env(100, int, description="API batch size")
+    api_key_parameter: Optional[str] = _env(
+        None,
+        description="SSM SecureString parameter holding the API key, read via the Parameters and Secrets extension"
+    )
+    api_key_header: str = _env("x-api-key", description="Request header carrying the API key")
+    schedule_minute: Optional[int] = _env(
+        None,
+        int,
+        description="Minute of the hour the extractor runs; derived from project and environment if unset"
+    )
 
     # Glue Configuration
-    glue_database_name: str = Field(default="data_pipeline_db", description="Glue database name")
-    glue_crawler_name: str = Field(default="data_pipeline_crawler", description="Glue crawler name")
-    crawler_schedule: str = Field(default="cron(0 2 * * ? *)", description="Crawler schedule")
+    glue_database_name: str = _env("data_pipeline_db", description="Glue database name")
+    glue_crawler_name: str = _env("data_pipeline_crawler", description="Glue crawler name")
+    crawler_schedule: str = _env("cron(0 2 * * ? *)", description="Crawler schedule")
 
     # Data Format
-    output_format: str = Field(default="parquet", description="Output format (parquet, csv, json)")
-    partition_keys: list = Field(default_factory=lambda: ["year", "month", "day"])
+    output_format: str = _env("parquet", description="Output format (parquet, csv, json)")
+    write_metadata_sidecar: bool = _env(
+        False,
+        _to_bool,
+        description="Write a .metadata.json object (schema, custom metadata) next to each data file"
+    )
+    partition_keys: Tuple[str, ...] = _env(("year", "month", "day"), _to_tuple)
 
     # Lake Formation
-    enable_lake_formation: bool = Field(default=True, description="Enable Lake Formation")
-    data_lake_admin_arn: Optional[str] = Field(default=None)
-
-    # Pydantic Settings (v2)
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        case_sensitive=False,
+    enable_lake_formation: bool = _env(True, _to_bool, description="Enable Lake Formation")
+    data_lake_admin_arn: Optional[str] = _env(None)
+
+    # Synthesis
+    skip_outputs: bool = _env(
+        False,
+        _to_bool,
+        description="Skip CfnOutput creation (for `cdk ls`; never deploy with this set)"
     )
 
-    @model_validator(mode="after")
-    def _fill_derived_defaults(self):
+    # Derived values, computed once in __post_init__
+    _common_tags: Mapping[str, str] = field(init=False, repr=False, compare=False)
+
+    def __init__(self, **overrides: Any) -> None:
+        """Resolve every field from overrides, the environment, or its default."""
+        for name, spec in self.__dataclass_fields__.items():
+            if not spec.init:
+                continue
+            if name in overrides:
+                value = overrides.pop(name)
+            else:
+                raw = _lookup(name)
+                value = spec.default if raw is None else spec.metadata["cast"](raw)
+            object.__setattr__(self, name, value)
+
+        if overrides:
+            raise TypeError(f"Unknown settings: {', '.join(sorted(overrides))}")
+
+        self.__post_init__()
+
+    def __post_init__(self) -> None:
+        # Fill derived defaults
         if not self.data_bucket_name:
-            self.data_bucket_name = f"{self.project_name}-{self.environment}-data-bucket"
+            object.__setattr__(self, "data_bucket_name", f"{self.project_name}-{self.environment}-data-bucket")
         if not self.athena_results_bucket:
-            self.athena_results_bucket = f"{self.project_name}-{self.environment}-athena-results"
-        return self
+            object.__setattr__(self, "athena_results_bucket", f"{self.project_name}-{self.environment}-athena-results")
+        if self.schedule_minute is None:
+            # Stable per deployment, so environments do not all cold-start at :00
+            digest = hashlib.blake2b(f"{self.project_name}-{self.environment}".encode(), digest_size=2).digest()
+            object.__setattr__(self, "schedule_minute", int.from_bytes(digest, "big") % 60)
+        elif not 0 <= self.schedule_minute < 60:
+            raise ValueError(f"schedule_minute must be between 0 and 59, got {self.schedule_minute}")
 
-    def get_common_tags(self) -> Dict[str, str]:
-        """Get common tags for all resources."""
-        return {
+        object.__setattr__(self, "_common_tags", MappingProxyType({
             "Environment": self.environment,
             "Project": self.project_name,
             "Owner": self.owner_tag,
             "ManagedBy": "CDK",
             "CostCenter": f"{self.project_name}-{self.environment}"
-        }
+        }))
+
+    def get_common_tags(self) -> Mapping[str, str]:
+        """Get common tags for all resources (shared, read-only mapping)."""
+        return self._common_tags
@@ -0,0 +1,94 @@
+"""Shared IAM policy actions and statement builders for the pipeline stacks."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Sequence
+
+if TYPE_CHECKING:
+    from aws_cdk import aws_iam as iam
+
+# Athena query execution
+ATHENA_QUERY_ACTIONS = (
+    "athena:GetWorkGroup",
+    "athena:StartQueryExecution",
+    "athena:StopQueryExecution",
+    "athena:GetQueryExecution",
+    "athena:GetQueryResults",
+    "athena:GetDataCatalog",
+    "athena:ListDataCatalogs",
+    "athena:ListWorkGroups"
+)
+
+# Glue Data Catalog read access
+GLUE_CATALOG_READ_ACTIONS = (
+    "glue:GetDatabase",
+    "glue:GetTable",
+    "glue:GetTables",
+    "glue:GetPartition",
+    "glue:GetPartitions",
+    "glue:GetDatabases"
+)
+
+# S3 access
+S3_READ_ACTIONS = (
+    "s3:GetObject",
+    "s3:ListBucket",
+    "s3:GetBucketLocation"
+)
+S3_RESULTS_ACTIONS = ("s3:PutObject",) + S3_READ_ACTIONS
+S3_CRAWLER_ACTIONS = S3_READ_ACTIONS + (
+    "s3:GetBucketAcl",
+    "s3:GetObjectVersion"
+)
+S3_LAMBDA_DATA_ACTIONS = (
+    "s3:PutObject",
+    "s3:PutObjectAcl",
+    "s3:GetObject",
+    "s3:GetObjectVersion",
+    "s3:DeleteObject",
+    "s3:ListBucket"
+)
+
+# CloudWatch Logs (Lambda and Glue)
+CLOUDWATCH_LOGS_ACTIONS = (
+    "logs:CreateLogGroup",
+    "logs:CreateLogStream",
+    "logs:PutLogEvents"
+)
+
+# X-Ray tracing
+XRAY_ACTIONS = (
+    "xray:PutTraceSegments",
+    "xray:PutTelemetryRecords"
+)
+
+# Lake Formation access for the Glue crawler
+LAKE_FORMATION_CRAWLER_ACTIONS = (
+    "lakeformation:GetDataAccess",
+    "lakeformation:GrantPermissions",
+    "lakeformation:GetResourceLFTags",
+    "lakeformation:ListLFTags",
+    "lakeformation:GetLFTag"
+)
+
+
+def allow_statement(sid: str, actions: Sequence[str], resources: Sequence[str]) -> iam.PolicyStatement:
+    """
+    Build an Allow statement from its JSON form in a single jsii call.
+
+    Args:
+        sid: Statement ID
+        actions: IAM actions to allow
+        resources: Resource ARNs (may contain CDK tokens)
+
+    Returns:
+        Policy statement
+    """
+    from aws_cdk import aws_iam as iam
+
+    return iam.PolicyStatement.from_json({
+        "Sid": sid,
+        "Effect": "Allow",
+        "Action": list(actions),
+        "Resource": list(resources)
+    })
@@ -0,0 +1,182 @@
+"""Optional background synth daemon that keeps aws_cdk imported between CDK runs.
+
+Importing aws_cdk starts the jsii Node runtime, which dominates the cost of
+``cdk synth``/``cdk ls`` for this app. With ``CDK_SYNTH_DAEMON=1`` set,
+``app.py`` hands synthesis to a long-lived process listening on a Unix socket
+and falls back to synthesizing in-process whenever no usable daemon answers.
+"""
+
+import getpass
+import hashlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+ENABLE_ENV = "CDK_SYNTH_DAEMON"
+DAEMON_FLAG = "--synth-daemon"
+
+# The daemon exits after this many seconds without a request
+IDLE_TIMEOUT = 600
+CONNECT_TIMEOUT = 0.2
+
+# Environment read by the jsii Node runtime when it starts; the daemon must not
+# inherit these, they are passed explicitly with every request instead
+CLI_ENV_PREFIX = "CDK_"
+CONTEXT_OVERFLOW_ENV = "CONTEXT_OVERFLOW_LOCATION_ENV"
+
+
+def is_enabled() -> bool:
+    """Check whether synthesis should be delegated to the daemon."""
+    return os.environ.get(ENABLE_ENV) == "1"
+
+
+def socket_path(project_root: Path) -> Path:
+    """Per-user, per-project socket location."""
+    key = hashlib.blake2b(str(project_root.resolve()).encode(), digest_size=6).hexdigest()
+    return Path(tempfile.gettempdir()) / f"cdk-synth-{getpass.getuser()}-{key}.sock"
+
+
+def log_path(project_root: Path) -> Path:
+    """Where a spawned daemon writes its errors, next to its socket."""
+    return socket_path(project_root).with_suffix(".log")
+
+
+def cli_context(environ: Dict[str, str]) -> Dict[str, Any]:
+    """Rebuild the context the CDK CLI passed through the environment."""
+    context = json.loads(environ.get("CDK_CONTEXT_JSON") or "{}")
+    overflow = environ.get(CONTEXT_OVERFLOW_ENV)
+    if overflow:
+        context.update(json.loads(Path(overflow).read_text(encoding="utf-8")))
+    return context
+
+
+def _send(conn: socket.socket, message: Dict[str, Any]) -> None:
+    conn.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def _receive(conn: socket.socket) -> Dict[str, Any]:
+    with conn.makefile("rb") as stream:
+        return json.loads(stream.readline() or b"{}")
+
+
+def request_synth(project_root: Path, payload: Dict[str, Any]) -> Optional[str]:
+    """
+    Ask a running daemon to synthesize.
+
+    Args:
+        project_root: Project directory the daemon was started for
+        payload: Request with ``source_hash``, ``settings`` and ``environ``
+
+    Returns:
+        Cloud assembly directory, or None if no daemon could serve the request
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(CONNECT_TIMEOUT)
+            client.connect(str(socket_path(project_root)))
+            # Synthesis itself can take a while
+            client.settimeout(None)
+            _send(client, payload)
+            response = _receive(client)
+    except (OSError, ValueError):
+        return None
+
+    return response.get("directory") if response.get("ok") else None
+
+
+def spawn(app_path: Path) -> None:
+    """Start a detached daemon so the next CDK invocation can use it."""
+    env = {
+        key: value for key, value in os.environ.items()
+        if not key.startswith(CLI_ENV_PREFIX) and key != CONTEXT_OVERFLOW_ENV
+    }
+    # Detached, so errors only surface in the log file
+    with open(log_path(app_path.parent), "ab") as log:
+        subprocess.Popen(
+            [sys.executable, str(app_path), DAEMON_FLAG],
+            cwd=str(app_path.parent),
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=log,
+            start_new_session=True
+        )
+
+
+def serve(project_root: Path, source_hash: str, handler: Callable[[Dict[str, Any]], str]) -> None:
+    """
+    Serve synth requests until idle or until the project sources change.
+
+    Args:
+        project_root: Project directory, used to derive the socket path
+        source_hash: Fingerprint of the sources loaded by this process
+        handler: Synthesizes a request and returns the assembly directory
+    """
+    path = socket_path(project_root)
+
+    # Another live daemon already owns the socket
+    if _is_listening(path):
+        return
+
+    path.unlink(missing_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(str(path))
+    finally:
+        os.umask(old_umask)
+    bound_inode = path.stat().st_ino
+
+    server.listen(1)
+    server.settimeout(IDLE_TIMEOUT)
+
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+
+            with conn:
+                conn.settimeout(None)
+                try:
+                    request = _receive(conn)
+                except (OSError, ValueError):
+                    continue
+
+                # Liveness probes connect and close without sending anything
+                if not request:
+                    continue
+
+                if request.get("source_hash") != source_hash:
+                    # Loaded stack code is outdated; let the client respawn us
+                    _send(conn, {"ok": False, "error": "stale"})
+                    break
+
+                try:
+                    _send(conn, {"ok": True, "directory": handler(request)})
+                except Exception as e:
+                    _send(conn, {"ok": False, "error": str(e)})
+    finally:
+        server.close()
+        # Only remove the socket if a newer daemon has not replaced it
+        try:
+            if path.stat().st_ino == bound_inode:
+                path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _is_listening(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        probe.settimeout(CONNECT_TIMEOUT)
+        try:
+            probe.connect(str(path))
+        except OSError:
+            return False
+    return True
@@ -1,20 +1,31 @@
 """Analytics stack for Athena and Lake Formation resources."""
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from aws_cdk import (
     Stack,
-    aws_athena as athena,
-    aws_iam as iam,
-    aws_lakeformation as lakeformation,
     Tags,
     CfnOutput
 )
-from constructs import Construct
 
 from infrastructure.config.settings import PipelineSettings
+from infrastructure.constructs.policies import (
+    ATHENA_QUERY_ACTIONS,
+    GLUE_CATALOG_READ_ACTIONS,
+    S3_READ_ACTIONS,
+    S3_RESULTS_ACTIONS,
+    allow_statement
+)
 from infrastructure.stacks.catalog_stack import CatalogStack
 from infrastructure.stacks.compute_stack import ComputeStack
 from infrastructure.stacks.storage_stack import StorageStack
 
+if TYPE_CHECKING:
+    from aws_cdk import aws_athena as athena, aws_iam as iam
+    from constructs import Construct
+
 
 class AnalyticsStack(Stack):
     """Stack for analytics resources including Athena and Lake Formation."""
@@ -48,16 +59,24 @@ class AnalyticsStack(Stack):
         self.catalog_stack = catalog_stack
         self.compute_stack = compute_stack
 
+        # Resource-level tags in CloudFormation key/value form, built once
+        self._resource_tags = (
+            {"key": "Environment", "value": settings.environment},
+            {"key": "Project", "value": settings.project_name}
+        )
+
+        # ARN prefixes shared by the policy statements; region and account are
+        # resolved through jsii, so read them once
+        region, account = self.region, self.account
+        self._athena_arn_prefix = f"arn:aws:athena:{region}:{account}"
+        self._glue_arn_prefix = f"arn:aws:glue:{region}:{account}"
+
         # Create Athena workgroup
         self.athena_workgroup = self._create_athena_workgroup()
 
         # Create analytics role
         self.analytics_role = self._create_analytics_role()
 
-        # Setup Lake Formation if enabled
-        if self.settings.enable_lake_formation:
-            self._setup_lake_formation()
-
         # Apply tags
         self._apply_tags()
 
@@ -66,6 +85,8 @@ class AnalyticsStack(Stack):
 
     def _create_athena_workgroup(self) -> athena.CfnWorkGroup:
         """Create Athena workgroup for query execution."""
+        from aws_cdk import aws_athena as athena
+
         workgroup = athena.CfnWorkGroup(
             self,
             "AthenaWorkGroup",
@@ -96,22 +117,61 @@ class AnalyticsStack(Stack):
                 bytes_scanned_cutoff_per_query=10737418240  # 10 GB
             ),
 
-            tags=[
-                {
-                    "key": "Environment",
-                    "value": self.settings.environment
-                },
-                {
-                    "key": "Project",
-                    "value": self.settings.project_name
-                }
-            ]
+            tags=list(self._resource_tags)
         )
 
         return workgroup
 
     def _create_analytics_role(self) -> iam.Role:
         """Create IAM role for analytics users."""
+        from aws_cdk import aws_iam as iam
+
+        # Resolved once; each attribute in the chain is a jsii round trip
+        db_name = self.catalog_stack.glue_database.database_input.name
+
+        # All statements go into one inline document instead of a DefaultPolicy
+        # built up by separate add_to_policy calls
+        document = iam.PolicyDocument(statements=[
+            # Athena permissions
+            allow_statement(
+                "AthenaAccess",
+                ATHENA_QUERY_ACTIONS,
+                [
+                    f"{self._athena_arn_prefix}:workgroup/{self.athena_workgroup.name}",
+                    f"{self._athena_arn_prefix}:datacatalog/AwsDataCatalog"
+                ]
+            ),
+
+            # Glue catalog permissions
+            allow_statement(
+                "GlueCatalogAccess",
+                GLUE_CATALOG_READ_ACTIONS,
+                [
+                    f"{self._glue_arn_prefix}:catalog",
+                    f"{self._glue_arn_prefix}:database/{db_name}",
+                    f"{self._glue_arn_prefix}:table/{db_name}/*"
+                ]
+            ),
+
+            # S3 permissions for data and results
+            allow_statement(
+                "S3DataAccess",
+                S3_READ_ACTIONS,
+                [
+                    self.storage_stack.data_bucket.bucket_arn,
+                    f"{self.storage_stack.data_bucket.bucket_arn}/*"
+                ]
+            ),
+            allow_statement(
+                "S3ResultsAccess",
+                S3_RESULTS_ACTIONS,
+                [
+                    self.storage_stack.athena_results_bucket.bucket_arn,
+                    f"{self.storage_stack.athena_results_bucket.bucket_arn}/*"
+                ]
+            )
+        ])
+
         role = iam.Role(
             self,
             "AnalyticsRole",
@@ -120,90 +180,73 @@ class AnalyticsStack(Stack):
                 iam.ServicePrincipal("athena.amazonaws.com"),
                 iam.AccountPrincipal(self.account)
             ),
-            description="Role for analytics users to query data"
+            description="Role for analytics users to query data",
+            inline_policies={"AnalyticsAccess": document}
         )
 
-        # Athena permissions
-        role.add_to_policy(
-            iam.PolicyStatement(
-                sid="AthenaAccess",
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "athena:GetWorkGroup",
-                    "athena:StartQueryExecution",
-                    "athena:StopQueryExecution",
-                    "athena:GetQueryExecution",
-                    "athena:GetQueryResults",
-                    "athena:GetDataCatalog",
-                    "athena:ListDataCatalogs",
-                    "athena:ListWorkGroups"
-                ],
-                resources=[
-                    f"arn:aws:athena:{self.region}:{self.account}:workgroup/{self.athena_workgroup.name}",
-                    f"arn:aws:athena:{self.region}:{self.account}:datacatalog/AwsDataCatalog"
-                ]
-            )
-        )
+        return role
 
-        # Glue catalog permissions
-        role.add_to_policy(
-            iam.PolicyStatement(
-                sid="GlueCatalogAccess",
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "glue:GetDatabase",
-                    "glue:GetTable",
-                    "glue:GetTables",
-                    "glue:GetPartition",
-                    "glue:GetPartitions",
-                    "glue:GetDatabases"
-                ],
-                resources=[
-                    f"arn:aws:glue:{self.region}:{self.account}:catalog",
-                    f"arn:aws:glue:{self.region}:{self.account}:database/{self.catalog_stack.glue_database.database_input.name}",
-                    f"arn:aws:glue:{self.region}:{self.account}:table/{self.catalog_stack.glue_database.database_input.name}/*"
-                ]
-            )
+    def _apply_tags(self) -> None:
+        """Apply resource-specific tags; common tags are inherited from the pipeline stack."""
+        Tags.of(self.athena_workgroup).add("Type", "Analytics")
+        Tags.of(self.analytics_role).add("Type", "AnalyticsRole")
+
+    def _create_outputs(self) -> None:
+        """Create stack outputs."""
+        if self.settings.skip_outputs:
+            return
+
+        CfnOutput(
+            self,
+            "AthenaWorkgroupName",
+            value=self.athena_workgroup.name,
+            description="Name of the Athena workgroup",
+            export_name=f"{self.stack_name}-workgroup-name"
         )
 
-        # S3 permissions for data and results
-        role.add_to_policy(
-            iam.PolicyStatement(
-                sid="S3DataAccess",
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "s3:GetObject",
-                    "s3:ListBucket",
-                    "s3:GetBucketLocation"
-                ],
-                resources=[
-                    self.storage_stack.data_bucket.bucket_arn,
-                    f"{self.storage_stack.data_bucket.bucket_arn}/*"
-                ]
-            )
+        CfnOutput(
+            self,
+            "AnalyticsRoleArn",
+            value=self.analytics_role.role_arn,
+            description="ARN of the analytics role",
+            export_name=f"{self.stack_name}-analytics-role-arn"
         )
 
-        role.add_to_policy(
-            iam.PolicyStatement(
-                sid="S3ResultsAccess",
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "s3:PutObject",
-                    "s3:GetObject",
-                    "s3:ListBucket",
-                    "s3:GetBucketLocation"
-                ],
-                resources=[
-                    self.storage_stack.athena_results_bucket.bucket_arn,
-                    f"{self.storage_stack.athena_results_bucket.bucket_arn}/*"
-                ]
-            )
+        CfnOutput(
+            self,
+            "QueryResultsLocation",
+            value=f"s3://{self.storage_stack.athena_results_bucket.bucket_name}/query-results/",
+            description="S3 location for Athena query results",
+            export_name=f"{self.stack_name}-query-results-location"
         )
 
-        return role
+
+class LakeFormationAnalyticsStack(AnalyticsStack):
+    """Analytics stack that also registers the data lake with Lake Formation.
+
+    Chosen instead of AnalyticsStack when ``enable_lake_formation`` is set, so
+    the plain stack never branches on the flag or imports aws_lakeformation.
+    """
+
+    def __init__(self, scope: Construct, id: str, **kwargs) -> None:
+        """
+        Initialize analytics stack with Lake Formation governance.
+
+        Args:
+            scope: Parent construct
+            id: Stack ID
+            **kwargs: AnalyticsStack arguments
+        """
+        super().__init__(scope, id, **kwargs)
+
+        # Setup Lake Formation
+        self._setup_lake_formation()
 
     def _setup_lake_formation(self) -> None:
         """Configure Lake Formation admins, data location, LF-Tags, and permissions."""
+        from aws_cdk import aws_lakeformation as lakeformation
+
+        db_name = self.catalog_stack.glue_database.database_input.name
 
         # 1) Data Lake administrators (use self.settings.data_lake_admin_arn; for quick unblock you can set it to <account>:root)
         data_lake_settings = lakeformation.CfnDataLakeSettings(
@@ -274,7 +317,7 @@ class AnalyticsStack(Stack):
             ),
             resource=lakeformation.CfnPermissions.ResourceProperty(
                 database_resource=lakeformation.CfnPermissions.DatabaseResourceProperty(
-                    name=self.catalog_stack.glue_database.database_input.name
+                    name=db_name
                 )
             ),
             permissions=["CREATE_TABLE", "ALTER", "DROP"]
@@ -290,7 +333,7 @@ class AnalyticsStack(Stack):
             ),
             resource=lakeformation.CfnPermissions.ResourceProperty(
                 table_resource=lakeformation.CfnPermissions.TableResourceProperty(
-                    database_name=self.catalog_stack.glue_database.database_input.name,
+                    database_name=db_name,
                     table_wildcard={}  # grant over all tables in the database
                 )
             ),
@@ -298,39 +341,3 @@ class AnalyticsStack(Stack):
             permissions_with_grant_option=[]
         )
         analytics_tbl_perm.add_dependency(data_lake_settings)
-
-    def _apply_tags(self) -> None:
-        """Apply tags to all resources in the stack."""
-        tags = self.settings.get_common_tags()
-
-        for key, value in tags.items():
-            Tags.of(self).add(key, value)
-
-        Tags.of(self.athena_workgroup).add("Type", "Analytics")
-        Tags.of(self.analytics_role).add("Type", "AnalyticsRole")
-
-    def _create_outputs(self) -> None:
-        """Create stack outputs."""
-        CfnOutput(
-            self,
-            "AthenaWorkgroupName",
-            value=self.athena_workgroup.name,
-            description="Name of the Athena workgroup",
-            export_name=f"{self.stack_name}-workgroup-name"
-        )
-
-        CfnOutput(
-            self,
-            "AnalyticsRoleArn",
-            value=self.analytics_role.role_arn,
-            description="ARN of the analytics role",
-            export_name=f"{self.stack_name}-analytics-role-arn"
-        )
-
-        CfnOutput(
-            self,
-            "QueryResultsLocation",
-            value=f"s3://{self.storage_stack.athena_results_bucket.bucket_name}/query-results/",
-            description="S3 location for Athena query results",
-            export_name=f"{self.stack_name}-query-results-location"
-        )
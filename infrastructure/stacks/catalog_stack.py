@@ -1,18 +1,48 @@
 """Catalog stack for AWS Glue resources."""
 
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, List
+
 from aws_cdk import (
     Stack,
-    aws_glue as glue,
-    aws_iam as iam,
-    aws_events as events,
     Tags,
     CfnOutput
 )
-from constructs import Construct
 
 from infrastructure.config.settings import PipelineSettings
+from infrastructure.constructs.policies import (
+    CLOUDWATCH_LOGS_ACTIONS,
+    LAKE_FORMATION_CRAWLER_ACTIONS,
+    S3_CRAWLER_ACTIONS,
+    allow_statement
+)
 from infrastructure.stacks.storage_stack import StorageStack
 
+if TYPE_CHECKING:
+    from aws_cdk import aws_glue as glue, aws_iam as iam
+    from constructs import Construct
+
+# Crawler configuration, serialized once at import time
+_CRAWLER_CONFIG_JSON = json.dumps(
+    {
+        "Version": 1.0,
+        "CrawlerOutput": {
+            "Partitions": {
+                "AddOrUpdateBehavior": "InheritFromTable"
+            },
+            "Tables": {
+                "AddOrUpdateBehavior": "MergeNewColumns"
+            }
+        },
+        "Grouping": {
+            "TableGroupingPolicy": "CombineCompatibleSchemas"
+        }
+    },
+    separators=(",", ":")
+)
+
 
 class CatalogStack(Stack):
     """Stack for AWS Glue catalog resources."""
@@ -40,6 +70,12 @@ class CatalogStack(Stack):
         self.settings = settings
         self.storage_stack = storage_stack
 
+        # Resource-level tags for the crawler, built once
+        self._resource_tags = {
+            "Environment": settings.environment,
+            "Project": settings.project_name
+        }
+
         # Create Glue database
         self.glue_database = self._create_glue_database()
 
@@ -60,6 +96,8 @@ class CatalogStack(Stack):
 
     def _create_glue_database(self) -> glue.CfnDatabase:
         """Create Glue database for data catalog."""
+        from aws_cdk import aws_glue as glue
+
         database = glue.CfnDatabase(
             self,
             "GlueDatabase",
@@ -80,9 +118,32 @@ class CatalogStack(Stack):
 
         return database
 
+    def _crawler_policy_statements(self) -> List[iam.PolicyStatement]:
+        """Statements for the crawler role's inline policy."""
+        return [
+            # S3 permissions
+            allow_statement(
+                "S3Access",
+                S3_CRAWLER_ACTIONS,
+                [
+                    self.storage_stack.data_bucket.bucket_arn,
+                    f"{self.storage_stack.data_bucket.bucket_arn}/*"
+                ]
+            ),
+
+            # CloudWatch Logs permissions
+            allow_statement(
+                "CloudWatchLogs",
+                CLOUDWATCH_LOGS_ACTIONS,
+                [f"arn:aws:logs:{self.region}:{self.account}:log-group:/aws-glue/*"]
+            )
+        ]
+
     def _create_crawler_role(self) -> iam.Role:
         """Create IAM role for Glue crawler."""
-        role = iam.Role(
+        from aws_cdk import aws_iam as iam
+
+        return iam.Role(
             self,
             "GlueCrawlerRole",
             assumed_by=iam.ServicePrincipal("glue.amazonaws.com"),
@@ -91,65 +152,16 @@ class CatalogStack(Stack):
                 iam.ManagedPolicy.from_aws_managed_policy_name(
                     "service-role/AWSGlueServiceRole"
                 )
-            ]
-        )
-
-        # Add S3 permissions
-        role.add_to_policy(
-            iam.PolicyStatement(
-                sid="S3Access",
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "s3:GetObject",
-                    "s3:ListBucket",
-                    "s3:GetBucketLocation",
-                    "s3:GetBucketAcl",
-                    "s3:GetObjectVersion"
-                ],
-                resources=[
-                    self.storage_stack.data_bucket.bucket_arn,
-                    f"{self.storage_stack.data_bucket.bucket_arn}/*"
-                ]
-            )
-        )
-
-        # Add CloudWatch Logs permissions
-        role.add_to_policy(
-            iam.PolicyStatement(
-                sid="CloudWatchLogs",
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "logs:CreateLogGroup",
-                    "logs:CreateLogStream",
-                    "logs:PutLogEvents"
-                ],
-                resources=[
-                    f"arn:aws:logs:{self.region}:{self.account}:log-group:/aws-glue/*"
-                ]
-            )
+            ],
+            inline_policies={
+                "GlueCrawlerAccess": iam.PolicyDocument(statements=self._crawler_policy_statements())
+            }
         )
 
-        # Add Lake Formation permissions if enabled
-        if self.settings.enable_lake_formation:
-            role.add_to_policy(
-                iam.PolicyStatement(
-                    sid="LakeFormationAccess",
-                    effect=iam.Effect.ALLOW,
-                    actions=[
-                        "lakeformation:GetDataAccess",
-                        "lakeformation:GrantPermissions",
-                        "lakeformation:GetResourceLFTags",
-                        "lakeformation:ListLFTags",
-                        "lakeformation:GetLFTag"
-                    ],
-                    resources=["*"]
-                )
-            )
-
-        return role
-
     def _create_glue_crawler(self) -> glue.CfnCrawler:
         """Create Glue crawler to catalog data."""
+        from aws_cdk import aws_glue as glue
+
         crawler = glue.CfnCrawler(
             self,
             "GlueCrawler",
@@ -173,22 +185,7 @@ class CatalogStack(Stack):
             ),
 
             # Crawler configuration
-            configuration="""
-            {
-                "Version": 1.0,
-                "CrawlerOutput": {
-                    "Partitions": {
-                        "AddOrUpdateBehavior": "InheritFromTable"
-                    },
-                    "Tables": {
-                        "AddOrUpdateBehavior": "MergeNewColumns"
-                    }
-                },
-                "Grouping": {
-                    "TableGroupingPolicy": "CombineCompatibleSchemas"
-                }
-            }
-            """,
+            configuration=_CRAWLER_CONFIG_JSON,
 
             # Schema change policy
             schema_change_policy=glue.CfnCrawler.SchemaChangePolicyProperty(
@@ -200,10 +197,7 @@ class CatalogStack(Stack):
             table_prefix=f"{self.settings.project_name}_",
 
             # Tags for the crawler
-            tags={
-                "Environment": self.settings.environment,
-                "Project": self.settings.project_name
-            }
+            tags=self._resource_tags
         )
 
         # Ensure database is created before crawler
@@ -214,6 +208,8 @@ class CatalogStack(Stack):
     def _create_crawler_schedule(self) -> None:
         """Create EventBridge rule to trigger crawler."""
         if self.settings.crawler_schedule:
+            from aws_cdk import aws_events as events
+
             # Parse cron expression for EventBridge
             # Convert AWS Glue cron to EventBridge format if needed
             schedule_expression = self.settings.crawler_schedule
@@ -232,18 +228,16 @@ class CatalogStack(Stack):
             # For simplicity, we'll rely on Glue's built-in scheduling
 
     def _apply_tags(self) -> None:
-        """Apply tags to all resources in the stack."""
-        tags = self.settings.get_common_tags()
-
-        for key, value in tags.items():
-            Tags.of(self).add(key, value)
-
+        """Apply resource-specific tags; common tags are inherited from the pipeline stack."""
         # Add specific tags
         Tags.of(self.glue_database).add("Type", "DataCatalog")
         Tags.of(self.glue_crawler).add("Type", "Crawler")
 
     def _create_outputs(self) -> None:
         """Create stack outputs."""
+        if self.settings.skip_outputs:
+            return
+
         CfnOutput(
             self,
             "GlueDatabaseName",
@@ -267,3 +261,16 @@ class CatalogStack(Stack):
             description="ARN of the Glue crawler role",
             export_name=f"{self.stack_name}-crawler-role-arn"
         )
+
+
+class LakeFormationCatalogStack(CatalogStack):
+    """Catalog stack whose crawler role can access Lake Formation-governed data.
+
+    Chosen instead of CatalogStack when ``enable_lake_formation`` is set.
+    """
+
+    def _crawler_policy_statements(self) -> List[iam.PolicyStatement]:
+        """Crawler statements plus Lake Formation access."""
+        return super()._crawler_policy_statements() + [
+            allow_statement("LakeFormationAccess", LAKE_FORMATION_CRAWLER_ACTIONS, ["*"])
+        ]
@@ -1,14 +1,18 @@
 """Compute stack for Lambda functions and related resources."""
 
 from pathlib import Path
+from typing import Optional
 
 from aws_cdk import (
     Stack,
+    aws_ec2 as ec2,
     aws_lambda as lambda_,
     aws_iam as iam,
     aws_events as events,
     aws_events_targets as targets,
     aws_logs as logs,
+    aws_sqs as sqs,
+    aws_ssm as ssm,
     Duration,
     Tags,
     CfnOutput
@@ -16,8 +20,17 @@ from aws_cdk import (
 from constructs import Construct
 
 from infrastructure.config.settings import PipelineSettings
+from infrastructure.constructs.policies import (
+    CLOUDWATCH_LOGS_ACTIONS,
+    S3_LAMBDA_DATA_ACTIONS,
+    XRAY_ACTIONS,
+    allow_statement
+)
 from infrastructure.stacks.storage_stack import StorageStack
 
+# Local build artifacts that must not end up in Lambda assets
+_ASSET_EXCLUDES = ["__pycache__", "*.pyc", ".pytest_cache"]
+
 
 class ComputeStack(Stack):
     """Stack for Lambda compute resources."""
@@ -28,6 +41,7 @@ class ComputeStack(Stack):
             id: str,
             settings: PipelineSettings,
             storage_stack: StorageStack,
+            vpc: Optional[ec2.IVpc] = None,
             **kwargs
     ) -> None:
         """
@@ -38,12 +52,24 @@ class ComputeStack(Stack):
             id: Stack ID
             settings: Pipeline settings
             storage_stack: Reference to storage stack
+            vpc: VPC to run the Lambda in; outside any VPC if omitted
             **kwargs: Additional stack properties
         """
         super().__init__(scope, id, **kwargs)
 
         self.settings = settings
         self.storage_stack = storage_stack
+        self.vpc = vpc
+
+        # Keep S3 traffic from a VPC-attached Lambda on the AWS network instead of NAT
+        if vpc is not None and settings.create_s3_gateway_endpoint:
+            ec2.GatewayVpcEndpoint(
+                self,
+                "S3GatewayEndpoint",
+                vpc=vpc,
+                service=ec2.GatewayVpcEndpointAwsService.S3,
+                subnets=[self._private_subnet_selection()]
+            )
 
         # Create Lambda layer for shared dependencies
         self.common_layer = self._create_lambda_layer()
@@ -54,6 +80,9 @@ class ComputeStack(Stack):
         # Create data extractor Lambda
         self.data_extractor = self._create_data_extractor_lambda()
 
+        # What the schedule invokes: a published alias when SnapStart is on
+        self.data_extractor_target = self._create_invocation_target()
+
         # Create scheduled trigger
         self._create_scheduled_trigger()
 
@@ -63,6 +92,12 @@ class ComputeStack(Stack):
         # Outputs
         self._create_outputs()
 
+    def _private_subnet_selection(self) -> ec2.SubnetSelection:
+        """Select the VPC's private subnets, falling back to isolated ones when there is no NAT."""
+        if self.vpc.private_subnets:
+            return ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS)
+        return ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_ISOLATED)
+
     def _create_lambda_layer(self) -> lambda_.LayerVersion:
         """Create Lambda layer for common dependencies."""
         layer_path = Path("lambdas/layers/common")
@@ -71,13 +106,10 @@ class ComputeStack(Stack):
         layer = lambda_.LayerVersion(
             self,
             "CommonUtilsLayer",
-            code=lambda_.Code.from_asset(str(layer_path)),
-            compatible_runtimes=[
-                lambda_.Runtime.PYTHON_3_13,
-                lambda_.Runtime.PYTHON_3_12,
-                lambda_.Runtime.PYTHON_3_11,
-                lambda_.Runtime.PYTHON_3_10
-            ],
+            code=lambda_.Code.from_asset(str(layer_path), exclude=_ASSET_EXCLUDES),
+            # Only the runtime and architecture the extractor actually uses
+            compatible_runtimes=[lambda_.Runtime.PYTHON_3_13],
+            compatible_architectures=[lambda_.Architecture.ARM_64],
             description="Common utilities and dependencies for Lambda functions",
             layer_version_name=f"{self.settings.project_name}-common-layer"
         )
@@ -86,32 +118,33 @@ class ComputeStack(Stack):
 
     def _create_lambda_role(self) -> iam.Role:
         """Create IAM role for Lambda execution."""
+        managed_policies = [
+            iam.ManagedPolicy.from_aws_managed_policy_name(
+                "service-role/AWSLambdaBasicExecutionRole"
+            )
+        ]
+        if self.vpc is not None:
+            # ENI management for VPC attachment; CDK only adds this to roles it creates
+            managed_policies.append(
+                iam.ManagedPolicy.from_aws_managed_policy_name(
+                    "service-role/AWSLambdaVPCAccessExecutionRole"
+                )
+            )
+
         role = iam.Role(
             self,
             "LambdaExecutionRole",
             assumed_by=iam.ServicePrincipal("lambda.amazonaws.com"),
             description="Execution role for data pipeline Lambda functions",
-            managed_policies=[
-                iam.ManagedPolicy.from_aws_managed_policy_name(
-                    "service-role/AWSLambdaBasicExecutionRole"
-                )
-            ]
+            managed_policies=managed_policies
         )
 
         # Add S3 permissions
         role.add_to_policy(
-            iam.PolicyStatement(
-                sid="S3DataAccess",
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "s3:PutObject",
-                    "s3:PutObjectAcl",
-                    "s3:GetObject",
-                    "s3:GetObjectVersion",
-                    "s3:DeleteObject",
-                    "s3:ListBucket"
-                ],
-                resources=[
+            allow_statement(
+                "S3DataAccess",
+                S3_LAMBDA_DATA_ACTIONS,
+                [
                     self.storage_stack.data_bucket.bucket_arn,
                     f"{self.storage_stack.data_bucket.bucket_arn}/*"
                 ]
@@ -120,32 +153,15 @@ class ComputeStack(Stack):
 
         # Add CloudWatch Logs permissions
         role.add_to_policy(
-            iam.PolicyStatement(
-                sid="CloudWatchLogs",
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "logs:CreateLogGroup",
-                    "logs:CreateLogStream",
-                    "logs:PutLogEvents"
-                ],
-                resources=[
-                    f"arn:aws:logs:{self.region}:{self.account}:log-group:/aws/lambda/*"
-                ]
+            allow_statement(
+                "CloudWatchLogs",
+                CLOUDWATCH_LOGS_ACTIONS,
+                [f"arn:aws:logs:{self.region}:{self.account}:log-group:/aws/lambda/*"]
             )
         )
 
         # Add X-Ray tracing permissions
-        role.add_to_policy(
-            iam.PolicyStatement(
-                sid="XRayTracing",
-                effect=iam.Effect.ALLOW,
-                actions=[
-                    "xray:PutTraceSegments",
-                    "xray:PutTelemetryRecords"
-                ],
-                resources=["*"]
-            )
-        )
+        role.add_to_policy(allow_statement("XRayTracing", XRAY_ACTIONS, ["*"]))
 
         return role
 
@@ -153,20 +169,59 @@ class ComputeStack(Stack):
         """Create Lambda function for data extraction."""
         lambda_path = Path("lambdas/data_extractor")
 
+        environment = {
+            "DATA_BUCKET_NAME": self.storage_stack.data_bucket.bucket_name,
+            "API_ENDPOINT": self.settings.api_endpoint,
+            "OUTPUT_FORMAT": self.settings.output_format,
+            "WRITE_METADATA_SIDECAR": str(self.settings.write_metadata_sidecar).lower(),
+            "LOG_LEVEL": "INFO",
+            "ENVIRONMENT": self.settings.environment
+        }
+
+        # The API key is served from the extension's local cache instead of an SSM call per invocation
+        params_and_secrets = None
+        if self.settings.api_key_parameter:
+            environment["API_KEY_PARAMETER"] = self.settings.api_key_parameter
+            environment["API_KEY_HEADER"] = self.settings.api_key_header
+            params_and_secrets = lambda_.ParamsAndSecretsLayerVersion.from_version(
+                lambda_.ParamsAndSecretsVersions.V1_0_103,
+                cache_size=10,
+                parameter_store_ttl=Duration.minutes(5)
+            )
+
+        bundling_command = (
+            # Install aarch64 wheels regardless of the bundling host's architecture
+            "pip install --no-cache-dir --no-compile -r requirements.txt " +
+            "-t /asset-output --platform manylinux2014_aarch64 --implementation cp " +
+            "--python-version 3.13 --only-binary=:all: && " +
+            "cp -au . /asset-output && " +
+            # Test suites shipped inside wheels (e.g. pyarrow/tests) are never imported
+            "rm -rf /asset-output/*/tests /asset-output/requirements.txt"
+        )
+        bundling = {
+            "image": lambda_.Runtime.PYTHON_3_13.bundling_image,
+            "command": ["bash", "-c", bundling_command]
+        }
+        if self.settings.compile_data_processor:
+            # Native build of the per-record loop; the extension module is imported
+            # ahead of data_processor.py, which stays in the asset as reference
+            bundling["command"][-1] += (
+                " && pip install --no-cache-dir -t /tmp/mypyc mypy setuptools && " +
+                "cd /asset-output && PYTHONPATH=/tmp/mypyc python -m mypyc data_processor.py && " +
+                "rm -rf build .mypy_cache"
+            )
+            # The extension must be compiled for the function's architecture
+            bundling["platform"] = "linux/arm64"
+
         function = lambda_.Function(
             self,
             "DataExtractorFunction",
             runtime=lambda_.Runtime.PYTHON_3_13,
+            architecture=lambda_.Architecture.ARM_64,
             code=lambda_.Code.from_asset(
                 str(lambda_path),
-                bundling={
-                    "image": lambda_.Runtime.PYTHON_3_13.bundling_image,
-                    "command": [
-                        "bash", "-c",
-                        "pip install --no-cache-dir -r requirements.txt -t /asset-output && " +
-                        "cp -au . /asset-output"
-                    ],
-                }
+                exclude=_ASSET_EXCLUDES,
+                bundling=bundling
             ),
             handler="handler.lambda_handler",
             role=self.lambda_role,
@@ -174,24 +229,53 @@ class ComputeStack(Stack):
             description="Extract data from public APIs and store in S3",
             timeout=Duration.seconds(self.settings.lambda_timeout),
             memory_size=self.settings.lambda_memory,
-            environment={
-                "DATA_BUCKET_NAME": self.storage_stack.data_bucket.bucket_name,
-                "API_ENDPOINT": self.settings.api_endpoint,
-                "OUTPUT_FORMAT": self.settings.output_format,
-                "LOG_LEVEL": "INFO",
-                "ENVIRONMENT": self.settings.environment
-            },
+            environment=environment,
             layers=[self.common_layer],
+            vpc=self.vpc,
+            vpc_subnets=self._private_subnet_selection() if self.vpc else None,
+            params_and_secrets=params_and_secrets,
             tracing=lambda_.Tracing.ACTIVE,
             retry_attempts=2,
             log_retention=logs.RetentionDays.ONE_WEEK if self.settings.environment == "dev" else logs.RetentionDays.ONE_MONTH,
+            # Snapshots are taken of published versions after init, skipping
+            # interpreter start-up and imports on cold starts
+            snap_start=lambda_.SnapStartConf.ON_PUBLISHED_VERSIONS if self.settings.enable_snap_start else None,
         )
 
         self.storage_stack.data_bucket.grant_write(function)
+        if self.settings.api_key_parameter:
+            ssm.StringParameter.from_secure_string_parameter_attributes(
+                self,
+                "ApiKeyParameter",
+                parameter_name=self.settings.api_key_parameter
+            ).grant_read(function)
         return function
 
+    def _create_invocation_target(self) -> lambda_.IFunction:
+        """Publish a version and alias for SnapStart, or use the function directly."""
+        if not self.settings.enable_snap_start:
+            return self.data_extractor
+
+        # SnapStart only applies to published versions, so invoke through an alias
+        return lambda_.Alias(
+            self,
+            "DataExtractorLiveAlias",
+            alias_name="live",
+            version=self.data_extractor.current_version
+        )
+
     def _create_scheduled_trigger(self) -> None:
         """Create EventBridge rule for scheduled execution."""
+        # Scheduled events that still fail after retries end up here
+        self.extraction_dlq = sqs.Queue(
+            self,
+            "DataExtractionDLQ",
+            queue_name=f"{self.settings.project_name}-extraction-dlq",
+            encryption=sqs.QueueEncryption.SQS_MANAGED,
+            enforce_ssl=True,
+            retention_period=Duration.days(14)
+        )
+
         # Create schedule rule
         rule = events.Rule(
             self,
@@ -199,7 +283,7 @@ class ComputeStack(Stack):
             rule_name=f"{self.settings.project_name}-extraction-schedule",
             description="Schedule for data extraction pipeline",
             schedule=events.Schedule.cron(
-                minute="0",
+                minute=str(self.settings.schedule_minute),
                 hour="*/6",  # Every 6 hours
                 month="*",
                 week_day="*",
@@ -210,28 +294,27 @@ class ComputeStack(Stack):
         # Add Lambda as target
         rule.add_target(
             targets.LambdaFunction(
-                self.data_extractor,
+                self.data_extractor_target,
                 retry_attempts=2,
-                max_event_age=Duration.hours(1)
+                max_event_age=Duration.hours(1),
+                dead_letter_queue=self.extraction_dlq
             )
         )
 
         # Grant invoke permission to EventBridge
-        self.data_extractor.grant_invoke(iam.ServicePrincipal("events.amazonaws.com"))
+        self.data_extractor_target.grant_invoke(iam.ServicePrincipal("events.amazonaws.com"))
 
     def _apply_tags(self) -> None:
-        """Apply tags to all resources in the stack."""
-        tags = self.settings.get_common_tags()
-
-        for key, value in tags.items():
-            Tags.of(self).add(key, value)
-
+        """Apply resource-specific tags; common tags are inherited from the pipeline stack."""
         # Add specific tags for Lambda
         Tags.of(self.data_extractor).add("Type", "DataExtractor")
         Tags.of(self.data_extractor).add("Schedule", "Every6Hours")
 
     def _create_outputs(self) -> None:
         """Create stack outputs."""
+        if self.settings.skip_outputs:
+            return
+
         CfnOutput(
             self,
             "DataExtractorFunctionName",
@@ -248,6 +331,14 @@ class ComputeStack(Stack):
             export_name=f"{self.stack_name}-extractor-function-arn"
         )
 
+        CfnOutput(
+            self,
+            "ExtractionDLQUrl",
+            value=self.extraction_dlq.queue_url,
+            description="URL of the dead-letter queue for failed scheduled extractions",
+            export_name=f"{self.stack_name}-extraction-dlq-url"
+        )
+
         CfnOutput(
             self,
             "LambdaRoleArn",
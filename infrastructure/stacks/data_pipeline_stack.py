@@ -3,15 +3,17 @@
 from aws_cdk import (
     Stack,
     Stage,
+    aws_ec2 as ec2,
     Tags,
     CfnOutput
 )
 from constructs import Construct
 
 from infrastructure.config.settings import PipelineSettings
-from infrastructure.stacks.analytics_stack import AnalyticsStack
-from infrastructure.stacks.catalog_stack import CatalogStack
+from infrastructure.stacks.analytics_stack import LakeFormationAnalyticsStack
+from infrastructure.stacks.catalog_stack import CatalogStack, LakeFormationCatalogStack
 from infrastructure.stacks.compute_stack import ComputeStack
+from infrastructure.stacks.power_tuning_stack import PowerTuningStack
 from infrastructure.stacks.storage_stack import StorageStack
 
 
@@ -38,6 +40,10 @@ class DataPipelineStack(Stack):
 
         self.settings = settings
 
+        # The only place common tags are added; the nested stacks inherit them
+        # and add just their Type tags
+        self._apply_tags()
+
         # Create storage stack
         self.storage_stack = StorageStack(
             self,
@@ -46,17 +52,20 @@ class DataPipelineStack(Stack):
             description="Storage resources for data pipeline"
         )
 
-        # Create compute stack
+        # Create compute stack, optionally inside an existing VPC
+        vpc = ec2.Vpc.from_lookup(self, "ExtractorVpc", vpc_id=settings.vpc_id) if settings.vpc_id else None
         self.compute_stack = ComputeStack(
             self,
             f"{id}-Compute",
             settings=settings,
             storage_stack=self.storage_stack,
+            vpc=vpc,
             description="Compute resources for data pipeline"
         )
 
-        # Create catalog stack
-        self.catalog_stack = CatalogStack(
+        # Create catalog stack, specialized up front for Lake Formation
+        catalog_stack_class = LakeFormationCatalogStack if settings.enable_lake_formation else CatalogStack
+        self.catalog_stack = catalog_stack_class(
             self,
             f"{id}-Catalog",
             settings=settings,
@@ -67,7 +76,7 @@ class DataPipelineStack(Stack):
         # Create analytics stack
         self.analytics_stack = None
         if self.settings.enable_lake_formation:
-            self.analytics_stack = AnalyticsStack(
+            self.analytics_stack = LakeFormationAnalyticsStack(
                 self,
                 f"{id}-Analytics",
                 settings=settings,
@@ -77,21 +86,30 @@ class DataPipelineStack(Stack):
                 description="Analytics resources for data pipeline"
             )
 
-        # Apply common tags
-        self._apply_tags()
+        # Optional tooling for right-sizing the extractor's memory
+        self.power_tuning_stack = None
+        if self.settings.enable_power_tuning:
+            self.power_tuning_stack = PowerTuningStack(
+                self,
+                f"{id}-PowerTuning",
+                settings=settings,
+                compute_stack=self.compute_stack,
+                description="Lambda Power Tuning state machine for data pipeline"
+            )
 
         # Create outputs
         self._create_outputs()
 
     def _apply_tags(self) -> None:
         """Apply common tags to all resources."""
-        tags = self.settings.get_common_tags()
-
-        for key, value in tags.items():
+        for key, value in self.settings.get_common_tags().items():
             Tags.of(self).add(key, value)
 
     def _create_outputs(self) -> None:
         """Create main stack outputs."""
+        if self.settings.skip_outputs:
+            return
+
         CfnOutput(
             self,
             "ProjectName",
@@ -157,6 +175,10 @@ class DataPipelineStage(Stage):
         """
         super().__init__(scope, id, **kwargs)
 
+        # Tag at the stage so every stack deployed through it carries the common tags
+        for key, value in settings.get_common_tags().items():
+            Tags.of(self).add(key, value)
+
         # Create main pipeline stack
         DataPipelineStack(
             self,
@@ -0,0 +1,82 @@
+"""Optional stack with the AWS Lambda Power Tuning state machine."""
+
+from aws_cdk import (
+    Stack,
+    aws_sam as sam,
+    CfnOutput
+)
+from constructs import Construct
+
+from infrastructure.config.settings import PipelineSettings
+from infrastructure.stacks.compute_stack import ComputeStack
+
+# Published Serverless Application Repository app (github.com/alexcasalboni/aws-lambda-power-tuning)
+POWER_TUNING_APPLICATION_ID = "arn:aws:serverlessrepo:us-east-1:451282441545:applications/aws-lambda-power-tuning"
+POWER_TUNING_VERSION = "4.3.6"
+
+# Memory sizes (MB) tried by default; CPU scales with memory, so the
+# cost-optimal point for the extractor usually sits in the middle
+POWER_VALUES = (512, 768, 1024, 1536, 1792, 2048, 3008)
+
+
+class PowerTuningStack(Stack):
+    """Stack deploying a Lambda Power Tuning state machine for the data extractor.
+
+    Only created when ``enable_power_tuning`` is set. Run
+    ``scripts/power_tune.py`` against it and commit the resulting
+    ``LAMBDA_MEMORY``; the extractor itself keeps a static memory size.
+    """
+
+    def __init__(
+            self,
+            scope: Construct,
+            id: str,
+            settings: PipelineSettings,
+            compute_stack: ComputeStack,
+            **kwargs
+    ) -> None:
+        """
+        Initialize power tuning stack.
+
+        Args:
+            scope: Parent construct
+            id: Stack ID
+            settings: Pipeline settings
+            compute_stack: Reference to compute stack
+            **kwargs: Additional stack properties
+        """
+        super().__init__(scope, id, **kwargs)
+
+        self.settings = settings
+        self.compute_stack = compute_stack
+
+        self.power_tuning_app = sam.CfnApplication(
+            self,
+            "PowerTuningApplication",
+            location=sam.CfnApplication.ApplicationLocationProperty(
+                application_id=POWER_TUNING_APPLICATION_ID,
+                semantic_version=POWER_TUNING_VERSION
+            ),
+            parameters={
+                # The tuner may only reconfigure and invoke the extractor; the
+                # wildcard also covers the versions and aliases it publishes
+                "lambdaResource": f"{compute_stack.data_extractor.function_arn}*",
+                "PowerValues": ",".join(str(value) for value in POWER_VALUES),
+                "stateMachineNamePrefix": f"{settings.project_name}-power-tuning"
+            }
+        )
+
+        self._create_outputs()
+
+    def _create_outputs(self) -> None:
+        """Create stack outputs."""
+        if self.settings.skip_outputs:
+            return
+
+        CfnOutput(
+            self,
+            "PowerTuningStateMachineArn",
+            value=self.power_tuning_app.get_att("Outputs.StateMachineARN").to_string(),
+            description="ARN of the Lambda Power Tuning state machine",
+            export_name=f"{self.stack_name}-power-tuning-state-machine-arn"
+        )
@@ -64,12 +64,14 @@ class StorageStack(Stack):
             # Lifecycle rules for cost optimization
             lifecycle_rules=[
                 s3.LifecycleRule(
-                    id="TransitionToIA",
+                    id="IntelligentTiering",
                     enabled=True,
                     transitions=[
+                        # Access patterns are unpredictable (Athena, ad hoc reads),
+                        # so let S3 move objects between tiers instead of a fixed IA date
                         s3.Transition(
-                            storage_class=s3.StorageClass.INFREQUENT_ACCESS,
-                            transition_after=Duration.days(30)
+                            storage_class=s3.StorageClass.INTELLIGENT_TIERING,
+                            transition_after=Duration.days(0)
                         ),
                         s3.Transition(
                             storage_class=s3.StorageClass.GLACIER,
@@ -141,12 +143,7 @@ class StorageStack(Stack):
         return bucket
 
     def _apply_tags(self) -> None:
-        """Apply tags to all resources in the stack."""
-        tags = self.settings.get_common_tags()
-
-        for key, value in tags.items():
-            Tags.of(self).add(key, value)
-
+        """Apply resource-specific tags; common tags are inherited from the pipeline stack."""
         # Add specific tags for S3 buckets
         Tags.of(self.data_bucket).add("Type", "DataLake")
         Tags.of(self.data_bucket).add("DataClassification", "Internal")
@@ -154,6 +151,9 @@ class StorageStack(Stack):
 
     def _create_outputs(self) -> None:
         """Create stack outputs."""
+        if self.settings.skip_outputs:
+            return
+
         CfnOutput(
             self,
             "DataBucketName",
@@ -1,20 +1,114 @@
 """API client for fetching data from external sources."""
 
 import logging
+import os
+import threading
 import time
-from typing import Dict, Any, List, Optional
-from urllib.parse import urljoin
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import quote, urlencode, urljoin
 
-import backoff
-import requests
+import urllib3
+
+# Support both: running as a package (tests) and as a flat zip (Lambda)
+try:
+    from .utils import json_loads
+except Exception:
+    from utils import json_loads
 
 logger = logging.getLogger(__name__)
 
+# Shared by every client in the process so warm Lambda invocations reuse
+# open TCP/TLS connections. Retry policy is set per client.
+_HTTP = urllib3.PoolManager(
+    num_pools=4,
+    maxsize=20,
+    headers={
+        "User-Agent": "DataPipeline/1.0",
+        "Accept": "application/json"
+    }
+)
+
+# Responses worth retrying
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Paginated fetches
+PAGE_FETCH_WORKERS = 5
+MAX_REQUESTS_PER_SECOND = 5.0
+
+# AWS Parameters and Secrets Lambda Extension (local HTTP cache for SSM)
+PARAMETER_CACHE_TTL = 300.0
+_PARAMETER_CACHE: Dict[str, Tuple[float, str]] = {}
+
+
+class APIError(Exception):
+    """Raised when the API responds with an error status."""
+
+
+class _RateLimiter:
+    """Spaces calls to ``wait`` at least ``1 / rate`` seconds apart across threads."""
+
+    def __init__(self, rate: Optional[float]):
+        self._interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def wait(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def get_parameter(name: str, ttl: float = PARAMETER_CACHE_TTL) -> str:
+    """
+    Read a (decrypted) SSM parameter through the Parameters and Secrets extension.
+
+    Values are also kept in-process for ``ttl`` seconds, so warm invocations
+    skip even the localhost round trip.
+
+    Args:
+        name: Parameter name or ARN
+        ttl: Seconds to reuse a fetched value
+
+    Returns:
+        Parameter value
+    """
+    now = time.monotonic()
+    cached = _PARAMETER_CACHE.get(name)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    port = os.environ.get("PARAMETERS_SECRETS_EXTENSION_HTTP_PORT", "2773")
+    response = _HTTP.request(
+        "GET",
+        f"http://localhost:{port}/systemsmanager/parameters/get?name={quote(name, safe='')}&withDecryption=true",
+        headers={"X-Aws-Parameters-Secrets-Token": os.environ.get("AWS_SESSION_TOKEN", "")},
+        timeout=5
+    )
+    if response.status >= 400:
+        raise APIError(f"{response.status} error reading parameter: {name}")
+
+    value = json_loads(response.data)["Parameter"]["Value"]
+    _PARAMETER_CACHE[name] = (now + ttl, value)
+    return value
+
 
 class APIClient:
     """Client for interacting with external APIs."""
 
-    def __init__(self, base_url: str, timeout: int = 30, max_retries: int = 3):
+    def __init__(
+            self,
+            base_url: str,
+            timeout: int = 30,
+            max_retries: int = 3,
+            http: Optional[urllib3.PoolManager] = None,
+            headers: Optional[Dict[str, str]] = None
+    ):
         """
         Initialize API client.
 
@@ -22,22 +116,25 @@ class APIClient:
             base_url: Base URL of the API
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
+            http: Connection pool to use; defaults to the shared module pool
+            headers: Extra headers sent with every request (e.g. an API key)
         """
         self.base_url = base_url
         self.timeout = timeout
         self.max_retries = max_retries
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "DataPipeline/1.0",
-            "Accept": "application/json"
-        })
-
-    @backoff.on_exception(
-        backoff.expo,
-        (requests.RequestException, requests.Timeout),
-        max_tries=3,
-        max_time=60
-    )
+        self.http = http or _HTTP
+        # request() replaces the pool's default headers, so merge them here
+        self.headers = {**self.http.headers, **headers} if headers else None
+        # Retried inside urllib3 with exponential backoff (0.5s, 1s, 2s, ...)
+        self.retries = urllib3.Retry(
+            total=max_retries,
+            backoff_factor=0.5,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=["GET", "HEAD"],
+            # Never forward credentials to another host on redirect
+            remove_headers_on_redirect=urllib3.Retry.DEFAULT_REMOVE_HEADERS_ON_REDIRECT | set(headers or ())
+        )
+
     def fetch_data(self, endpoint: str = "", params: Optional[Dict] = None) -> List[Dict[str, Any]]:
         """
         Fetch data from the API with retry logic.
@@ -50,18 +147,18 @@ class APIClient:
             List of data records
         """
         url = urljoin(self.base_url, endpoint) if endpoint else self.base_url
+        if params:
+            # Some configured endpoints already carry a query string
+            url = f"{url}{'&' if '?' in url else '?'}{urlencode(params)}"
 
         logger.info(f"Fetching data from: {url}")
 
         try:
-            response = self.session.get(
-                url,
-                params=params,
-                timeout=self.timeout
-            )
-            response.raise_for_status()
+            response = self.http.request("GET", url, timeout=self.timeout, retries=self.retries, headers=self.headers)
+            if response.status >= 400:
+                raise APIError(f"{response.status} error for url: {url}")
 
-            data = response.json()
+            data = json_loads(response.data)
 
             # Handle different response structures
             if isinstance(data, list):
@@ -81,7 +178,7 @@ class APIClient:
                 logger.warning(f"Unexpected data type: {type(data)}")
                 return []
 
-        except requests.RequestException as e:
+        except (urllib3.exceptions.HTTPError, APIError) as e:
             logger.error(f"API request failed: {str(e)}")
             raise
         except ValueError as e:
@@ -92,38 +189,59 @@ class APIClient:
             self,
             endpoint: str = "",
             page_size: int = 100,
-            max_pages: Optional[int] = None
+            max_pages: Optional[int] = None,
+            max_workers: int = PAGE_FETCH_WORKERS,
+            requests_per_second: Optional[float] = MAX_REQUESTS_PER_SECOND
     ) -> List[Dict[str, Any]]:
         """
         Fetch paginated data from the API.
 
+        Keeps a window of up to ``max_workers`` pages in flight and stops at
+        the first empty page. Pages are combined in page order.
+
         Args:
             endpoint: API endpoint
             page_size: Number of records per page
             max_pages: Maximum number of pages to fetch
+            max_workers: Maximum number of concurrent page requests
+            requests_per_second: Request rate cap, or None for no cap
 
         Returns:
             Combined list of all records
         """
-        all_data = []
-        page = 1
-
-        while True:
-            if max_pages and page > max_pages:
-                break
+        limiter = _RateLimiter(requests_per_second)
 
-            params = {"page": page, "per_page": page_size}
-            data = self.fetch_data(endpoint, params)
+        def fetch_page(page: int) -> List[Dict[str, Any]]:
+            limiter.wait()
+            return self.fetch_data(endpoint, {"page": page, "per_page": page_size})
 
-            if not data:
-                break
-
-            all_data.extend(data)
-            logger.info(f"Fetched page {page} with {len(data)} records")
+        all_data = []
+        pending: Dict[int, Future] = {}
+        next_page = 1
+        page = 1
 
-            # Simple rate limiting
-            time.sleep(0.5)
-            page += 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                while True:
+                    # Keep the window full
+                    while len(pending) < max_workers and not (max_pages and next_page > max_pages):
+                        pending[next_page] = executor.submit(fetch_page, next_page)
+                        next_page += 1
+
+                    if page not in pending:
+                        break
+
+                    data = pending.pop(page).result()
+                    if not data:
+                        break
+
+                    all_data.extend(data)
+                    logger.info(f"Fetched page {page} with {len(data)} records")
+                    page += 1
+            finally:
+                # Pages past the end (or after a failure) are not needed
+                for future in pending.values():
+                    future.cancel()
 
         logger.info(f"Total records fetched: {len(all_data)}")
         return all_data
@@ -132,4 +250,6 @@ class APIClient:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.session.close()
+        # The shared pool outlives the client
+        if self.http is not _HTTP:
+            self.http.clear()
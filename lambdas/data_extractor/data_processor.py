@@ -1,10 +1,14 @@
 """Data processing and transformation logic."""
 
 import hashlib
-import json
+import importlib
 import logging
 from datetime import datetime, UTC
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+# Support both: running as a package (tests) and as a flat zip (Lambda).
+# Resolved by name because mypyc cannot compile relative imports in a flat module.
+json_dumps = importlib.import_module(f"{__package__}.utils" if __package__ else "utils").json_dumps
 
 logger = logging.getLogger(__name__)
 
@@ -12,36 +16,73 @@ logger = logging.getLogger(__name__)
 class DataProcessor:
     """Process and transform raw data."""
 
-    def process(self, raw_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # No per-instance __dict__
+    __slots__ = ("flatten_lists_as_json",)
+
+    # Define required fields based on your data model
+    REQUIRED_FIELDS = ("id",)  # Add more as needed
+
+    def __init__(self, flatten_lists_as_json: bool = False):
+        """
+        Initialize data processor.
+
+        Args:
+            flatten_lists_as_json: Store list values as JSON strings, for sinks
+                without native list columns (JSON/CSV). Parquet keeps lists as
+                Arrow list columns that Athena can query into.
+        """
+        self.flatten_lists_as_json = flatten_lists_as_json
+
+    def process(self, raw_data: List[Dict[str, Any]], now_iso: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Process raw data from API.
 
         Args:
             raw_data: Raw data from API
+            now_iso: Batch processing timestamp to reuse; read from the clock if omitted
 
         Returns:
             Processed data ready for storage
         """
-        processed_data = []
+        processed_data = list(self.iter_process(raw_data, now_iso))
+
+        logger.info(f"Successfully processed {len(processed_data)}/{len(raw_data)} records")
+        return processed_data
+
+    def iter_process(
+            self,
+            raw_data: Iterable[Dict[str, Any]],
+            now_iso: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Process raw records lazily, one at a time.
+
+        Args:
+            raw_data: Raw records from API
+            now_iso: Batch processing timestamp to reuse; read from the clock if omitted
+
+        Yields:
+            Processed records; invalid records are skipped
+        """
+        # One timestamp for the whole batch instead of two clock reads per record
+        now_iso = now_iso or datetime.now(UTC).isoformat()
 
         for record in raw_data:
             try:
-                processed_record = self._process_record(record)
-                if processed_record:
-                    processed_data.append(processed_record)
+                processed_record = self._process_record(record, now_iso)
             except Exception as e:
                 logger.error(f"Failed to process record: {str(e)}, Record: {record}")
                 continue
+            if processed_record:
+                yield processed_record
 
-        logger.info(f"Successfully processed {len(processed_data)}/{len(raw_data)} records")
-        return processed_data
-
-    def _process_record(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _process_record(self, record: Dict[str, Any], now_iso: str) -> Optional[Dict[str, Any]]:
         """
         Process individual record.
 
         Args:
             record: Raw record
+            now_iso: Batch processing timestamp (ISO 8601)
 
         Returns:
             Processed record or None if invalid
@@ -51,86 +92,102 @@ class DataProcessor:
             return None
 
         # Create processed record with standardized fields
-        processed = {
-            # Preserve original ID or generate one
-            "id": str(record.get("id", self._generate_id(record))),
+        processed: Dict[str, Any] = {
+            # Preserve original ID or generate one (only hashed when missing)
+            "id": str(record["id"]) if "id" in record else self._generate_id(record),
 
             # Standardize timestamps
-            "created_at": datetime.now(UTC).isoformat(),
-            "processed_at": datetime.now(UTC).isoformat(),
+            "created_at": now_iso,
+            "processed_at": now_iso
+        }
 
-            # Flatten nested structures if present
-            **self._flatten_record(record),
+        # Flatten nested structures in the same pass that counts filled fields
+        filled_fields = self._flatten_into(record, processed)
 
-            # Add data quality indicators
-            "data_quality_score": self._calculate_quality_score(record),
-            "is_complete": self._check_completeness(record)
-        }
+        # Add data quality indicators
+        processed["data_quality_score"] = round(filled_fields / len(record), 2)
+        processed["is_complete"] = self._check_completeness(record)
 
         return processed
 
-    def _flatten_record(self, record: Dict[str, Any], parent_key: str = "", sep: str = "_") -> Dict[str, Any]:
+    def _flatten_record(self, record: Dict[str, Any], sep: str = "_") -> Dict[str, Any]:
         """
         Flatten nested dictionary structures.
 
         Args:
             record: Record to flatten
-            parent_key: Parent key for nested fields
             sep: Separator for flattened keys
 
         Returns:
             Flattened dictionary
         """
-        items = []
-
-        for key, value in record.items():
-            new_key = f"{parent_key}{sep}{key}" if parent_key else key
+        flattened: Dict[str, Any] = {}
+        self._flatten_into(record, flattened, sep)
+        return flattened
 
-            if isinstance(value, dict):
-                items.extend(self._flatten_record(value, new_key, sep=sep).items())
-            elif isinstance(value, list):
-                # Convert lists to JSON strings for storage
-                items.append((new_key, json.dumps(value)))
-            else:
-                items.append((new_key, value))
-
-        return dict(items)
-
-    def _generate_id(self, record: Dict[str, Any]) -> str:
-        """Generate unique ID for record."""
-        content = json.dumps(record, sort_keys=True)
-        return hashlib.md5(content.encode()).hexdigest()
-
-    def _calculate_quality_score(self, record: Dict[str, Any]) -> float:
+    def _flatten_into(self, record: Dict[str, Any], out: Dict[str, Any], sep: str = "_") -> int:
         """
-        Calculate data quality score.
+        Flatten a record into ``out`` and count its filled top-level fields.
+
+        Walks the record with an explicit stack of item iterators instead of
+        recursing, writing straight into ``out`` in the original key order.
 
         Args:
-            record: Record to evaluate
+            record: Record to flatten
+            out: Dictionary receiving the flattened fields
+            sep: Separator for flattened keys
 
         Returns:
-            Quality score between 0 and 1
+            Number of top-level fields that are neither None nor empty strings
         """
-        total_fields = len(record)
-        if total_fields == 0:
-            return 0.0
+        filled_fields = 0
+        stack = [("", iter(record.items()))]
+
+        while stack:
+            parent_key, items = stack[-1]
+            for key, value in items:
+                if parent_key:
+                    new_key = f"{parent_key}{sep}{key}"
+                else:
+                    new_key = key
+                    if value is not None and value != "":
+                        filled_fields += 1
+
+                if isinstance(value, dict):
+                    # Descend now; the parent iterator resumes afterwards
+                    stack.append((new_key, iter(value.items())))
+                    break
+                elif self.flatten_lists_as_json and isinstance(value, list):
+                    # Convert lists to JSON strings for storage
+                    out[new_key] = json_dumps(value).decode()
+                else:
+                    out[new_key] = value
+            else:
+                stack.pop()
+
+        return filled_fields
 
-        filled_fields = sum(1 for v in record.values() if v is not None and v != "")
-        return round(filled_fields / total_fields, 2)
+    def _generate_id(self, record: Dict[str, Any]) -> str:
+        """Generate unique ID for record from its canonical (key-sorted) JSON."""
+        return hashlib.blake2b(json_dumps(record, sort_keys=True), digest_size=16).hexdigest()
 
     def _check_completeness(self, record: Dict[str, Any]) -> bool:
         """Check if record has all required fields."""
-        # Define required fields based on your data model
-        required_fields = ["id"]  # Add more as needed
-        return all(record.get(field) is not None for field in required_fields)
-
-    def add_metadata(self, data: List[Dict[str, Any]], metadata: Dict[str, Any]) -> Dict[str, Any]:
+        return all(record.get(field) is not None for field in self.REQUIRED_FIELDS)
+
+    def add_metadata(
+            self,
+            data: List[Dict[str, Any]],
+            metadata: Dict[str, Any],
+            now_iso: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Add metadata to processed data.
 
         Args:
             data: Processed data
             metadata: Metadata to add
+            now_iso: Processing timestamp to reuse; read from the clock if omitted
 
         Returns:
             Metadata dictionary
@@ -138,6 +195,6 @@ class DataProcessor:
         return {
             **metadata,
             "record_count": len(data),
-            "processing_timestamp": datetime.now(UTC).isoformat(),
+            "processing_timestamp": now_iso or datetime.now(UTC).isoformat(),
             "schema_version": "1.0.0"
         }
@@ -1,27 +1,53 @@
 """Lambda handler for data extraction from public APIs."""
 
-import json
 import os
 import traceback
 from datetime import datetime, UTC
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Optional
 
 # Support both: running as a package (tests) and as a flat zip (Lambda)
 try:
-    from .api_client import APIClient
+    from .api_client import APIClient, get_parameter
     from .data_processor import DataProcessor
     from .s3_writer import S3Writer
-    from .utils import setup_logging, get_partition_path
+    from .utils import setup_logging, get_partition_path, json_dumps
 except Exception:
-    from api_client import APIClient
+    from api_client import APIClient, get_parameter
     from data_processor import DataProcessor
     from s3_writer import S3Writer
-    from utils import setup_logging, get_partition_path
+    from utils import setup_logging, get_partition_path, json_dumps
 
 # Setup logging
 logger = setup_logging()
 
 
+def _prime_snapshot() -> None:
+    """Import lazily loaded dependencies so the SnapStart snapshot includes them."""
+    if os.environ.get("OUTPUT_FORMAT", "parquet") == "parquet":
+        import pyarrow.parquet  # noqa: F401
+
+
+try:
+    # Only available in the Lambda Python runtime
+    from snapshot_restore_py import register_before_snapshot
+except ImportError:
+    pass
+else:
+    register_before_snapshot(_prime_snapshot)
+
+
+@lru_cache(maxsize=4)
+def _get_api_client(
+        api_endpoint: str,
+        api_key_header: Optional[str] = None,
+        api_key: Optional[str] = None
+) -> APIClient:
+    """Reuse one client per endpoint (and key) across warm invocations."""
+    headers = {api_key_header: api_key} if api_key_header else None
+    return APIClient(api_endpoint, headers=headers)
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Main Lambda handler for data extraction pipeline.
@@ -42,6 +68,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         api_endpoint = os.environ.get("API_ENDPOINT", "https://jsonplaceholder.typicode.com/users")
         bucket_name = os.environ["DATA_BUCKET_NAME"]
         output_format = os.environ.get("OUTPUT_FORMAT", "parquet")
+        write_metadata_sidecar = os.environ.get("WRITE_METADATA_SIDECAR", "false").lower() == "true"
 
         # Extract optional parameters from event
         force_refresh = event.get("force_refresh", False)
@@ -52,41 +79,57 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             f"Format: {output_format}, ForceRefresh: {force_refresh}"
         )
 
-        # Step 1: Fetch data from API
-        api_client = APIClient(api_endpoint)
+        # Step 1: Fetch data from API (clients are cached and share a module-level
+        # connection pool, so warm invocations skip the TLS handshake)
+        api_key_parameter = os.environ.get("API_KEY_PARAMETER")
+        if api_key_parameter:
+            # Served (and cached) by the Parameters and Secrets extension
+            api_client = _get_api_client(
+                api_endpoint,
+                os.environ.get("API_KEY_HEADER", "x-api-key"),
+                get_parameter(api_key_parameter)
+            )
+        else:
+            api_client = _get_api_client(api_endpoint)
         raw_data = api_client.fetch_data(params=api_params)
 
         if not raw_data:
             logger.warning("No data received from API")
             return {
                 "statusCode": 204,
-                "body": json.dumps({"message": "No data to process"})
+                "body": json_dumps({"message": "No data to process"}).decode()
             }
 
         logger.info(f"Fetched {len(raw_data)} records from API")
 
         # Step 2: Process and transform data
-        processor = DataProcessor()
-        processed_data = processor.process(raw_data)
+        # One clock read stamps the records, metadata, partition and key
+        now = datetime.now(UTC)
+        extraction_time = now.isoformat()
+        # Parquet stores lists natively; the text formats get them as JSON strings
+        processor = DataProcessor(flatten_lists_as_json=output_format != "parquet")
+        processed_data = processor.process(raw_data, now_iso=extraction_time)
 
         # Add metadata
         metadata = processor.add_metadata(processed_data, {
             "source": api_endpoint,
-            "extraction_time": datetime.now(UTC).isoformat(),
+            "extraction_time": extraction_time,
             "request_id": request_id
-        })
+        }, now_iso=extraction_time)
 
         logger.info(f"Processed {len(processed_data)} records")
 
         # Step 3: Write to S3
         s3_writer = S3Writer(bucket_name)
-        partition_path = get_partition_path()
+        partition_path = get_partition_path(now)
 
         s3_key = s3_writer.write_data(
             data=processed_data,
             prefix=f"raw-data/{partition_path}",
             format=output_format,
-            metadata=metadata
+            metadata=metadata,
+            now=now,
+            write_metadata_sidecar=write_metadata_sidecar
         )
 
         logger.info(f"Data written to S3: s3://{bucket_name}/{s3_key}")
@@ -94,7 +137,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Return success response
         response = {
             "statusCode": 200,
-            "body": json.dumps({
+            "body": json_dumps({
                 "message": "Data extraction completed successfully",
                 "details": {
                     "records_processed": len(processed_data),
@@ -102,7 +145,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                     "format": output_format,
                     "request_id": request_id
                 }
-            })
+            }).decode()
         }
 
         return response
@@ -111,11 +154,11 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         logger.error(f"Missing required configuration: {str(e)}")
         return {
             "statusCode": 500,
-            "body": json.dumps({"error": f"Configuration error: {str(e)}"})
+            "body": json_dumps({"error": f"Configuration error: {str(e)}"}).decode()
         }
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}\n{traceback.format_exc()}")
         return {
             "statusCode": 500,
-            "body": json.dumps({"error": f"Processing failed: {str(e)}"})
+            "body": json_dumps({"error": f"Processing failed: {str(e)}"}).decode()
         }
@@ -1,50 +1,130 @@
 """S3 writer for storing processed data."""
 
-import json
+import csv
+import gzip
+import io
 import logging
+from operator import itemgetter
 from datetime import datetime, UTC
 from typing import Dict, Any, List, Optional
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+
+# Support both: running as a package (tests) and as a flat zip (Lambda)
+try:
+    from .utils import json_dumps
+except Exception:
+    from utils import json_dumps
 
 logger = logging.getLogger(__name__)
 
+# Records converted to Arrow at a time when writing Parquet
+PARQUET_BATCH_SIZE = 10_000
+PARQUET_DATA_PAGE_SIZE = 1 << 20
+
+# JSON/CSV output is gzipped; level 1 trades a little size for much less CPU
+GZIP_COMPRESS_LEVEL = 1
+
+# Payloads above this are uploaded in concurrent parts; smaller ones skip the
+# CreateMultipartUpload round trip with a single PUT
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+MULTIPART_CHUNKSIZE = 16 * 1024 * 1024
+MULTIPART_CONCURRENCY = 10
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_THRESHOLD,
+    multipart_chunksize=MULTIPART_CHUNKSIZE,
+    max_concurrency=MULTIPART_CONCURRENCY,
+    use_threads=True
+)
+
+
+# One client per container, created on first use and reused by warm invocations.
+# The pool covers the multipart upload threads.
+_S3_CLIENT = None
+_S3_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+    tcp_keepalive=True
+)
+
+
+def _get_s3_client():
+    """Return the shared S3 client, creating it on first use."""
+    global _S3_CLIENT
+    if _S3_CLIENT is None:
+        _S3_CLIENT = boto3.client("s3", config=_S3_CLIENT_CONFIG)
+    return _S3_CLIENT
+
 
 class S3Writer:
     """Write data to S3 in various formats."""
 
-    def __init__(self, bucket_name: str):
-        """Initialize S3 writer."""
+    def __init__(self, bucket_name: str, compress: bool = True, s3_client=None):
+        """
+        Initialize S3 writer.
+
+        Args:
+            bucket_name: Target bucket
+            compress: Gzip JSON and CSV output (Parquet is always Snappy-compressed)
+            s3_client: S3 client to use; defaults to the shared module client
+        """
         self.bucket_name = bucket_name
-        self.s3_client = boto3.client("s3")
+        self.compress = compress
+        self.s3_client = s3_client or _get_s3_client()
+        self.transfer_config = _TRANSFER_CONFIG
 
     def write_data(
             self,
             data: List[Dict[str, Any]],
             prefix: str,
             format: str = "json",  # Cambiar default a JSON
-            metadata: Optional[Dict[str, Any]] = None
+            metadata: Optional[Dict[str, Any]] = None,
+            now: Optional[datetime] = None,
+            write_metadata_sidecar: bool = False
     ) -> str:
-        """Write data to S3 in specified format."""
-        timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+        """
+        Write data to S3 in specified format (``now`` stamps the key and metadata).
+
+        Custom metadata always goes on the object itself; the ``.metadata.json``
+        sidecar (a second PUT plus a schema scan) is only written on request.
+        """
+        now = now or datetime.now(UTC)
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
 
-        # Por ahora solo soportar JSON y CSV sin pandas
-        if format in ["parquet", "json"]:
-            # Usar JSON como fallback para parquet
+        # Parquet falls back to JSON when it cannot be written
+        content = self._to_parquet(data) if format == "parquet" else None
+
+        if content is not None:
+            written_format = "parquet"
+            s3_key = f"{prefix}/data_{timestamp}.parquet"
+            content_type = "application/vnd.apache.parquet"
+        elif format in ["parquet", "json"]:
+            written_format = "json"
             s3_key = f"{prefix}/data_{timestamp}.json"
             content = self._to_json(data)
             content_type = "application/json"
         elif format == "csv":
+            written_format = "csv"
             s3_key = f"{prefix}/data_{timestamp}.csv"
             content = self._to_csv_simple(data)
             content_type = "text/csv"
         else:
             raise ValueError(f"Unsupported format: {format}")
 
+        # One object per invocation; compress the text formats
+        compression = "snappy" if written_format == "parquet" else None
+        if compression is None and self.compress:
+            content = gzip.compress(content, compresslevel=GZIP_COMPRESS_LEVEL)
+            s3_key += ".gz"
+            compression = "gzip"
+
         # Prepare S3 metadata
         s3_metadata = {
             "record_count": str(len(data)),
-            "format": "json" if format == "parquet" else format,  # Temporal
+            "format": written_format,
+            "compression": compression or "none",
             "timestamp": timestamp
         }
 
@@ -55,19 +135,27 @@ class S3Writer:
 
         # Upload to S3
         try:
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=content,
-                ContentType=content_type,
-                Metadata=s3_metadata,
-                ServerSideEncryption="AES256"
-            )
+            extra_args = {
+                "ContentType": content_type,
+                "Metadata": s3_metadata,
+                "ServerSideEncryption": "AES256"
+            }
+            if len(content) >= MULTIPART_THRESHOLD:
+                # Parts are uploaded concurrently by the transfer manager
+                self.s3_client.upload_fileobj(
+                    Fileobj=io.BytesIO(content),
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    ExtraArgs=extra_args,
+                    Config=self.transfer_config
+                )
+            else:
+                self.s3_client.put_object(Bucket=self.bucket_name, Key=s3_key, Body=content, **extra_args)
 
             logger.info(f"Successfully wrote {len(data)} records to s3://{self.bucket_name}/{s3_key}")
 
-            # Write metadata file
-            self._write_metadata_file(s3_key, data, metadata)
+            if write_metadata_sidecar:
+                self._write_metadata_file(s3_key, data, metadata, now)
 
             return s3_key
 
@@ -76,8 +164,54 @@ class S3Writer:
             raise
 
     def _to_json(self, data: List[Dict[str, Any]]) -> bytes:
-        """Convert data to JSON format."""
-        return json.dumps(data, indent=2, default=str).encode('utf-8')
+        """Convert data to JSON format (compact; the object is gzipped and machine-read)."""
+        return json_dumps(data)
+
+    def _to_parquet(self, data: List[Dict[str, Any]]) -> Optional[bytes]:
+        """
+        Convert data to Snappy-compressed Parquet, one record batch at a time.
+
+        Returns:
+            Parquet bytes, or None if pyarrow is unavailable or the records do
+            not fit a single schema
+        """
+        try:
+            # Imported lazily; JSON and CSV runs do not pay for pyarrow
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            logger.warning("pyarrow is not available, writing JSON instead of Parquet")
+            return None
+
+        if not data:
+            return None
+
+        # Arrow-native sink: pages are appended in C++ without Python file calls
+        buffer = pa.BufferOutputStream()
+        writer = None
+        try:
+            for start in range(0, len(data), PARQUET_BATCH_SIZE):
+                batch = data[start:start + PARQUET_BATCH_SIZE]
+                # Later batches are coerced to the schema inferred from the first
+                table = pa.Table.from_pylist(batch, schema=writer.schema if writer else None)
+                if writer is None:
+                    writer = pq.ParquetWriter(
+                        buffer,
+                        table.schema,
+                        compression="snappy",
+                        # Dictionary/RLE encoding keeps repetitive string columns small
+                        use_dictionary=True,
+                        data_page_size=PARQUET_DATA_PAGE_SIZE
+                    )
+                writer.write_table(table)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            logger.warning(f"Records do not fit a Parquet schema, writing JSON instead: {str(e)}")
+            return None
+        finally:
+            if writer is not None:
+                writer.close()
+
+        return buffer.getvalue().to_pybytes()
 
     def _to_csv_simple(self, data: List[Dict[str, Any]]) -> bytes:
         """Convert data to CSV format without pandas."""
@@ -87,34 +221,50 @@ class S3Writer:
         # Get headers from first record
         headers = list(data[0].keys())
 
-        # Build CSV
-        lines = []
-        lines.append(",".join(headers))
+        # csv.writer quotes values containing delimiters, quotes or newlines
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(headers)
 
-        for record in data:
-            values = [str(record.get(h, "")) for h in headers]
-            lines.append(",".join(values))
+        # Records are normalized to the same keys, so stream rows through a
+        # C-level itemgetter and only rewrite with .get() if one is missing
+        body_start = buffer.tell()
+        if not headers:
+            # itemgetter() needs at least one key; a first record of {} gives empty rows
+            rows = ([] for _ in data)
+        elif len(headers) == 1:
+            # A single key returns the bare value, not a 1-tuple
+            rows = zip(map(itemgetter(*headers), data))
+        else:
+            rows = map(itemgetter(*headers), data)
+        try:
+            writer.writerows(rows)
+        except KeyError:
+            buffer.seek(body_start)
+            buffer.truncate()
+            writer.writerows([record.get(h, "") for h in headers] for record in data)
 
-        return "\n".join(lines).encode('utf-8')
+        return buffer.getvalue().encode('utf-8')
 
     def _write_metadata_file(self, data_key: str, data: List[Dict[str, Any]],
-                             metadata: Optional[Dict[str, Any]]) -> None:
+                             metadata: Optional[Dict[str, Any]], now: Optional[datetime] = None) -> None:
         """Write metadata file alongside data file."""
         metadata_key = f"{data_key}.metadata.json"
 
         metadata_content = {
             "data_file": data_key,
-            "created_at": datetime.now(UTC).isoformat(),
+            "created_at": (now or datetime.now(UTC)).isoformat(),
             "record_count": len(data),
             "schema": self._infer_schema(data),
             "custom_metadata": metadata or {}
         }
 
         try:
+            # Machine-read only, so no indentation; pretty-print locally if needed
             self.s3_client.put_object(
                 Bucket=self.bucket_name,
                 Key=metadata_key,
-                Body=json.dumps(metadata_content, indent=2).encode('utf-8'),
+                Body=json_dumps(metadata_content),
                 ContentType="application/json"
             )
             logger.info(f"Metadata written to {metadata_key}")
@@ -122,14 +272,26 @@ class S3Writer:
             logger.warning(f"Failed to write metadata file: {str(e)}")
 
     def _infer_schema(self, data: List[Dict[str, Any]]) -> Dict[str, str]:
-        """Infer schema from data."""
+        """
+        Infer schema from data.
+
+        Each field takes the type of its first non-null value, so a null in
+        the first record no longer reports the column as ``NoneType``.
+        """
         if not data:
             return {}
 
-        schema = {}
-        sample = data[0]
-
-        for key, value in sample.items():
-            schema[key] = type(value).__name__
+        # Records share the first record's keys, so stop once all are typed
+        first_keys = data[0].keys()
+        found: Dict[str, str] = {}
+        for record in data:
+            for key, value in record.items():
+                if value is not None and key not in found:
+                    found[key] = type(value).__name__
+            if found.keys() >= first_keys:
+                break
 
+        # Keep the first record's column order; all-null columns stay NoneType
+        schema = {key: found.pop(key, "NoneType") for key in first_keys}
+        schema.update(found)
         return schema
@@ -1,9 +1,19 @@
 """Utility functions for Lambda."""
 
+import json
 import logging
 import os
-from datetime import datetime, UTC
-from typing import Dict
+import re
+from datetime import date, datetime, time, UTC
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # Bundled via requirements.txt; optional for local runs
+    orjson = None
+
+# Shortest digit run that can exceed orjson's integer range (-2**63 .. 2**64 - 1)
+_LONG_DIGIT_RUN = re.compile(rb"\d{19}")
 
 
 def setup_logging(level: str = None) -> logging.Logger:
@@ -34,15 +44,17 @@ def setup_logging(level: str = None) -> logging.Logger:
     return logger
 
 
-def get_partition_path() -> str:
+def get_partition_path(now: Optional[datetime] = None) -> str:
     """
     Get S3 partition path based on current date.
 
+    Args:
+        now: Time to partition by; read from the clock if omitted
+
     Returns:
         Partition path string (year=YYYY/month=MM/day=DD)
     """
-    now = datetime.now(UTC)
-    return f"year={now.year}/month={now.month:02d}/day={now.day:02d}"
+    return (now or datetime.now(UTC)).strftime("year=%Y/month=%m/day=%d")
 
 
 def validate_environment() -> Dict[str, str]:
@@ -67,3 +79,54 @@ def validate_environment() -> Dict[str, str]:
         "OUTPUT_FORMAT": os.environ.get("OUTPUT_FORMAT", "parquet"),
         "LOG_LEVEL": os.environ.get("LOG_LEVEL", "INFO")
     }
+
+
+def json_dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes, using orjson when it is available.
+
+    Args:
+        obj: Object to serialize; unsupported values are converted with str()
+        indent: Indent with two spaces
+        sort_keys: Sort object keys
+
+    Returns:
+        Encoded JSON
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=str, option=option)
+
+    # Same bytes as orjson, so hashes of the output (generated IDs) do not depend on the backend
+    return json.dumps(
+        obj,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+        sort_keys=sort_keys,
+        ensure_ascii=False,
+        default=_json_default
+    ).encode("utf-8")
+
+
+def _json_default(value: Any) -> str:
+    """Stringify values the stdlib encoder rejects, with dates in ISO 8601 like orjson."""
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return str(value)
+
+
+def json_loads(data: bytes) -> Any:
+    """
+    Deserialize JSON bytes or text, using orjson when it is available.
+
+    orjson silently turns integers outside the 64-bit range into floats, so
+    payloads with a run of 19 or more digits are parsed by the stdlib, which
+    keeps them exact (e.g. large numeric IDs).
+    """
+    if orjson is not None and _LONG_DIGIT_RUN.search(data.encode() if isinstance(data, str) else data) is None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Run Lambda Power Tuning against the data extractor and record the best memory size.
+
+Requires the stack to be deployed with ENABLE_POWER_TUNING=true. The optimal
+power is written to LAMBDA_MEMORY in .env, so the next deploy picks it up.
+"""
+
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+import boto3
+
+STACK_NAME = "data-pipeline-dev"
+ENV_FILE = Path(__file__).resolve().parent.parent / ".env"
+
+# Invocations per power value, and what "optimal" means (cost, speed or balanced)
+NUM_INVOCATIONS = 10
+STRATEGY = "cost"
+
+
+def stack_output(cf_client, suffix: str) -> str:
+    """Find an output by key suffix across the pipeline's stacks."""
+    paginator = cf_client.get_paginator("describe_stacks")
+    for page in paginator.paginate():
+        for stack in page["Stacks"]:
+            if not stack["StackName"].startswith(STACK_NAME):
+                continue
+            for output in stack.get("Outputs", []):
+                if output["OutputKey"].endswith(suffix):
+                    return output["OutputValue"]
+    raise LookupError(f"No stack output ending in {suffix!r}; is power tuning deployed?")
+
+
+def write_memory(memory: int) -> None:
+    """Set LAMBDA_MEMORY in .env, adding it if missing."""
+    text = ENV_FILE.read_text(encoding="utf-8") if ENV_FILE.exists() else ""
+    line = f"LAMBDA_MEMORY={memory}"
+    if re.search(r"^LAMBDA_MEMORY=.*$", text, flags=re.MULTILINE):
+        text = re.sub(r"^LAMBDA_MEMORY=.*$", line, text, flags=re.MULTILINE)
+    else:
+        text = f"{text.rstrip()}\n{line}\n".lstrip()
+    ENV_FILE.write_text(text, encoding="utf-8")
+
+
+def power_tune() -> int:
+    cf_client = boto3.client("cloudformation")
+    sfn_client = boto3.client("stepfunctions")
+
+    state_machine_arn = stack_output(cf_client, "PowerTuningStateMachineArn")
+    function_arn = stack_output(cf_client, "DataExtractorFunctionArn")
+
+    print(f"⚡ Tuning {function_arn}")
+    execution = sfn_client.start_execution(
+        stateMachineArn=state_machine_arn,
+        input=json.dumps({
+            "lambdaARN": function_arn,
+            "num": NUM_INVOCATIONS,
+            "payload": {},
+            "strategy": STRATEGY
+        })
+    )
+
+    while True:
+        result = sfn_client.describe_execution(executionArn=execution["executionArn"])
+        if result["status"] != "RUNNING":
+            break
+        time.sleep(10)
+
+    if result["status"] != "SUCCEEDED":
+        raise RuntimeError(f"Power tuning execution {result['status']}")
+
+    output = json.loads(result["output"])
+    memory = int(output["power"])
+    print(f"✅ Optimal memory: {memory} MB ({STRATEGY})")
+    if "stateMachine" in output and "visualization" in output["stateMachine"]:
+        print(f"   Visualization: {output['stateMachine']['visualization']}")
+
+    return memory
+
+
+if __name__ == "__main__":
+    try:
+        write_memory(power_tune())
+    except (LookupError, RuntimeError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"📝 Updated {ENV_FILE}; commit the new LAMBDA_MEMORY and redeploy")
@@ -1,6 +1,7 @@
 """Integration tests for the complete pipeline."""
 
-import json
+import gzip
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, UTC
 
 import boto3
@@ -8,19 +9,21 @@ import pytest
 from moto import mock_aws
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def aws_credentials():
-    """Mocked AWS Credentials for moto."""
-    import os
-    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
-    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
-    os.environ["AWS_SECURITY_TOKEN"] = "testing"
-    os.environ["AWS_SESSION_TOKEN"] = "testing"
-    os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
+    """Mocked AWS Credentials for moto (restored after the session)."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("AWS_ACCESS_KEY_ID", "testing")
+        mp.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+        mp.setenv("AWS_SECURITY_TOKEN", "testing")
+        mp.setenv("AWS_SESSION_TOKEN", "testing")
+        mp.setenv("AWS_DEFAULT_REGION", "us-east-1")
+        yield
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def moto_env(aws_credentials):
+    """One moto backend for the module; tests use their own bucket names."""
     with mock_aws():
         yield
 
@@ -45,21 +48,26 @@ class TestPipelineIntegration:
 
     def test_end_to_end_data_flow(self, s3_client, lambda_client, glue_client):
         """Test complete data flow from API to S3."""
-        # Create test bucket
+        # Create test bucket and database (independent, so side by side)
         bucket_name = "test-data-bucket"
-        s3_client.create_bucket(Bucket=bucket_name)
-
-        # Create test database
         database_name = "test_database"
-        glue_client.create_database(
-            DatabaseInput={
-                'Name': database_name,
-                'Description': 'Test database'
-            }
-        )
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            setup = [
+                executor.submit(s3_client.create_bucket, Bucket=bucket_name),
+                executor.submit(
+                    glue_client.create_database,
+                    DatabaseInput={
+                        'Name': database_name,
+                        'Description': 'Test database'
+                    }
+                )
+            ]
+            for future in setup:
+                future.result()
 
         # Simulate Lambda execution
         from lambdas.data_extractor.s3_writer import S3Writer
+        from lambdas.data_extractor.utils import json_loads
 
         # Create test data
         test_data = [
@@ -77,7 +85,7 @@ class TestPipelineIntegration:
 
         # Verify data was written
         response = s3_client.get_object(Bucket=bucket_name, Key=s3_key)
-        stored_data = json.loads(response['Body'].read())
+        stored_data = json_loads(gzip.decompress(response['Body'].read()))
 
         assert len(stored_data) == 2
         assert stored_data[0]["id"] == 1
@@ -89,23 +97,11 @@ class TestPipelineIntegration:
 
         from lambdas.data_extractor.utils import get_partition_path
 
-        # Get partition path
-        partition_path = get_partition_path()
-
-        # Verify format
-        assert "year=" in partition_path
-        assert "month=" in partition_path
-        assert "day=" in partition_path
-
-        # Parse and verify values
-        parts = partition_path.split("/")
-        assert len(parts) == 3
+        # Explicit time: exact, no clock involved
+        assert get_partition_path(datetime(2024, 7, 15, 12, tzinfo=UTC)) == "year=2024/month=07/day=15"
 
-        year = int(parts[0].split("=")[1])
-        month = int(parts[1].split("=")[1])
-        day = int(parts[2].split("=")[1])
-
-        now = datetime.now(UTC)
-        assert year == now.year
-        assert month == now.month
-        assert day == now.day
+        # Clock read: bracket the call so a run across midnight UTC cannot flake
+        before = datetime.now(UTC)
+        partition_path = get_partition_path()
+        after = datetime.now(UTC)
+        assert partition_path in {t.strftime("year=%Y/month=%m/day=%d") for t in (before, after)}
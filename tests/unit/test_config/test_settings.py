@@ -0,0 +1,60 @@
+import pytest
+
+from infrastructure.config.settings import PipelineSettings
+
+
+def test_settings_read_environment(monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "staging")
+    monkeypatch.setenv("PROJECT_NAME", "pipe")
+    monkeypatch.setenv("LAMBDA_MEMORY", "256")
+    monkeypatch.setenv("ENABLE_LAKE_FORMATION", "false")
+
+    settings = PipelineSettings()
+
+    assert settings.environment == "staging"
+    assert settings.lambda_memory == 256
+    assert settings.enable_lake_formation is False
+    assert settings.athena_results_bucket == "pipe-staging-athena-results"
+
+
+def test_settings_keyword_arguments_win(monkeypatch):
+    monkeypatch.setenv("ENVIRONMENT", "staging")
+
+    settings = PipelineSettings(environment="test", data_bucket_name="")
+
+    assert settings.environment == "test"
+    assert settings.data_bucket_name == f"{settings.project_name}-test-data-bucket"
+
+
+def test_settings_reject_invalid_values(monkeypatch):
+    monkeypatch.setenv("ENABLE_LAKE_FORMATION", "maybe")
+
+    with pytest.raises(ValueError):
+        PipelineSettings()
+
+    monkeypatch.delenv("ENABLE_LAKE_FORMATION")
+    with pytest.raises(TypeError):
+        PipelineSettings(unknown="value")
+
+
+def test_common_tags_are_shared_and_read_only():
+    settings = PipelineSettings(environment="test", project_name="pipe")
+
+    tags = settings.get_common_tags()
+
+    assert tags is settings.get_common_tags()
+    assert tags["CostCenter"] == "pipe-test"
+    with pytest.raises(TypeError):
+        tags["Owner"] = "someone"
+
+
+def test_schedule_minute_is_derived_per_environment(monkeypatch):
+    monkeypatch.delenv("SCHEDULE_MINUTE", raising=False)
+
+    dev = PipelineSettings(environment="dev", project_name="pipe")
+
+    assert 0 <= dev.schedule_minute < 60
+    assert dev.schedule_minute == PipelineSettings(environment="dev", project_name="pipe").schedule_minute
+    assert PipelineSettings(schedule_minute=15).schedule_minute == 15
+    with pytest.raises(ValueError):
+        PipelineSettings(schedule_minute=60)
@@ -0,0 +1,83 @@
+import threading
+import time
+
+import pytest
+
+from infrastructure import daemon
+
+
+def _start_daemon(monkeypatch, tmp_path, handler):
+    sock = tmp_path / "synth.sock"
+    monkeypatch.setattr(daemon, "socket_path", lambda root: sock)
+    monkeypatch.setattr(daemon, "IDLE_TIMEOUT", 5)
+
+    thread = threading.Thread(target=daemon.serve, args=(tmp_path, "hash-1", handler), daemon=True)
+    thread.start()
+    for _ in range(100):
+        if sock.exists():
+            break
+        time.sleep(0.01)
+    return thread, sock
+
+
+def test_request_synth_round_trip(monkeypatch, tmp_path):
+    thread, sock = _start_daemon(monkeypatch, tmp_path, lambda request: request["environ"]["CDK_OUTDIR"])
+
+    directory = daemon.request_synth(tmp_path, {
+        "source_hash": "hash-1",
+        "settings": {},
+        "environ": {"CDK_OUTDIR": "/tmp/out"}
+    })
+    assert directory == "/tmp/out"
+
+    # A request built from different sources makes the daemon exit
+    assert daemon.request_synth(tmp_path, {"source_hash": "hash-2"}) is None
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert not sock.exists()
+
+
+def test_request_synth_without_daemon(monkeypatch, tmp_path):
+    monkeypatch.setattr(daemon, "socket_path", lambda root: tmp_path / "missing.sock")
+
+    assert daemon.request_synth(tmp_path, {"source_hash": "hash-1"}) is None
+
+
+def test_handler_errors_are_reported_as_misses(monkeypatch, tmp_path):
+    def failing_handler(request):
+        raise RuntimeError("boom")
+
+    thread, _ = _start_daemon(monkeypatch, tmp_path, failing_handler)
+
+    assert daemon.request_synth(tmp_path, {"source_hash": "hash-1", "environ": {}}) is None
+    daemon.request_synth(tmp_path, {"source_hash": "stop"})
+    thread.join(timeout=5)
+
+
+def test_cli_context_merges_overflow_file(tmp_path):
+    overflow = tmp_path / "context.json"
+    overflow.write_text('{"b": 2}', encoding="utf-8")
+
+    context = daemon.cli_context({
+        "CDK_CONTEXT_JSON": '{"a": 1}',
+        daemon.CONTEXT_OVERFLOW_ENV: str(overflow)
+    })
+
+    assert context == {"a": 1, "b": 2}
+
+
+def test_daemon_exits_when_warm_up_fails(monkeypatch, capsys):
+    import app
+
+    def failing_synth(*args, **kwargs):
+        raise RuntimeError("bad settings")
+
+    serve_calls = []
+    monkeypatch.setattr(app, "synthesize", failing_synth)
+    monkeypatch.setattr(daemon, "serve", lambda *args: serve_calls.append(args))
+
+    with pytest.raises(SystemExit):
+        app.serve_daemon()
+
+    assert serve_calls == []
+    assert "bad settings" in capsys.readouterr().err
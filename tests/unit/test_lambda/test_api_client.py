@@ -1,18 +1,83 @@
-from requests import sessions
+import json
+from urllib.parse import parse_qs, urlsplit
+
+import urllib3
+
+from lambdas.data_extractor import api_client
 from lambdas.data_extractor.api_client import APIClient
 
 class DummyResp:
     def __init__(self, status=200, json_data=None):
-        self.status_code = status
-        self._json = json_data or []
-    def json(self, **_): return self._json
-    def raise_for_status(self): pass
+        self.status = status
+        self.data = json.dumps(json_data or []).encode()
 
 def test_fetch_data_success(monkeypatch):
-    def fake_get(self, url, params=None, timeout=None, **kwargs):
+    def fake_request(self, method, url, timeout=None, **kwargs):
         return DummyResp(200, [{"id": 1}])
 
-    monkeypatch.setattr(sessions.Session, "get", fake_get, raising=True)
+    monkeypatch.setattr(urllib3.PoolManager, "request", fake_request, raising=True)
 
     cli = APIClient("https://example.com")
     assert cli.fetch_data({}) == [{"id": 1}]
+
+def test_fetch_data_appends_params_to_existing_query(monkeypatch):
+    urls = []
+
+    def fake_request(self, method, url, timeout=None, **kwargs):
+        urls.append(url)
+        return DummyResp(200, {"results": [{"id": 1}]})
+
+    monkeypatch.setattr(urllib3.PoolManager, "request", fake_request, raising=True)
+
+    cli = APIClient("https://example.com/api/?results=100")
+    assert cli.fetch_data(params={"page": 2}) == [{"id": 1}]
+    assert urls == ["https://example.com/api/?results=100&page=2"]
+
+def test_clients_share_pool():
+    first = APIClient("https://example.com")
+    second = APIClient("https://example.org")
+    assert first.http is second.http is api_client._HTTP
+
+    # Transient failures are retried per client
+    assert set(first.retries.status_forcelist) == {429, 500, 502, 503, 504}
+    assert first.retries.total == 3
+
+    with first:
+        pass
+    assert first.http.headers["Accept"] == "application/json"
+
+def test_fetch_paginated_data_stops_at_empty_page(monkeypatch):
+    def fake_request(self, method, url, timeout=None, **kwargs):
+        page = int(parse_qs(urlsplit(url).query)["page"][0])
+        return DummyResp(200, [{"page": page}] if page <= 3 else [])
+
+    monkeypatch.setattr(urllib3.PoolManager, "request", fake_request, raising=True)
+
+    cli = APIClient("https://example.com")
+    data = cli.fetch_paginated_data(page_size=1, requests_per_second=None)
+    assert data == [{"page": 1}, {"page": 2}, {"page": 3}]
+    assert len(cli.fetch_paginated_data(page_size=1, max_pages=2, requests_per_second=None)) == 2
+
+def test_get_parameter_is_cached(monkeypatch):
+    calls = []
+
+    def fake_request(self, method, url, timeout=None, **kwargs):
+        calls.append((url, kwargs["headers"]))
+        return DummyResp(200, {"Parameter": {"Value": "secret"}})
+
+    monkeypatch.setattr(urllib3.PoolManager, "request", fake_request, raising=True)
+    monkeypatch.setenv("AWS_SESSION_TOKEN", "token")
+    monkeypatch.setattr(api_client, "_PARAMETER_CACHE", {})
+
+    assert api_client.get_parameter("/app/key") == "secret"
+    assert api_client.get_parameter("/app/key") == "secret"
+    assert len(calls) == 1
+    url, headers = calls[0]
+    assert url.startswith("http://localhost:2773/systemsmanager/parameters/get?name=%2Fapp%2Fkey")
+    assert headers == {"X-Aws-Parameters-Secrets-Token": "token"}
+
+def test_api_key_header_is_dropped_on_redirect():
+    cli = APIClient("https://example.com", headers={"X-Api-Key": "k"})
+    assert cli.headers["X-Api-Key"] == "k"
+    assert cli.headers["Accept"] == "application/json"
+    assert "x-api-key" in cli.retries.remove_headers_on_redirect
@@ -0,0 +1,38 @@
+import json
+
+from lambdas.layers.common.python.common_utils import DataQualityChecker, LambdaResponse, safe_json_dumps
+
+
+def test_safe_json_dumps_handles_big_integers():
+    assert json.loads(safe_json_dumps({"n": 2 ** 70})) == {"n": 2 ** 70}
+
+    response = LambdaResponse.error("boom", details={"id": 2 ** 70})
+    assert json.loads(response["body"])["details"]["id"] == 2 ** 70
+
+
+def test_validate_schema_clean_data():
+    data = [{"id": 1, "name": "Ana"}, {"id": 2, "name": None}, {"id": 3}]
+    assert DataQualityChecker.validate_schema(data, {"id": int, "name": str}) == (True, [])
+
+
+def test_validate_schema_reports_each_mismatch():
+    data = [{"id": 1, "name": "Ana"}, {"id": "2", "name": 5}, {"id": 3.0}]
+
+    is_valid, errors = DataQualityChecker.validate_schema(data, {"id": int, "name": str})
+
+    assert not is_valid
+    assert errors == [
+        "Record 1: Field 'id' has type str, expected int",
+        "Record 1: Field 'name' has type int, expected str",
+        "Record 2: Field 'id' has type float, expected int",
+    ]
+
+
+def test_validate_schema_accepts_bool_for_int():
+    # bool subclasses int, as in an isinstance() check
+    assert DataQualityChecker.validate_schema([{"n": True}, {"n": 2}], {"n": int}) == (True, [])
+
+
+def test_detect_duplicates_lists_each_key_once():
+    data = [{"id": 1}, {"id": 2}, {"id": 1}, {"id": 1}, {"id": 3}, {"id": 2}, {}, {"id": None}, {}]
+    assert DataQualityChecker.detect_duplicates(data, "id") == [1, 2]
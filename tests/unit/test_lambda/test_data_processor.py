@@ -1,3 +1,5 @@
+import json
+
 from lambdas.data_extractor.data_processor import DataProcessor
 
 def test_process_and_metadata():
@@ -10,3 +12,41 @@ def test_process_and_metadata():
     md = p.add_metadata(out, {"source": "test"})
     assert md["record_count"] == 2
     assert md["source"] == "test"
+
+
+def test_batch_shares_one_timestamp():
+    p = DataProcessor()
+    out = p.process([{"id": 1}, {"id": 2}])
+    assert out[0]["created_at"] == out[0]["processed_at"] == out[1]["processed_at"]
+
+    md = p.add_metadata(out, {}, now_iso=out[0]["processed_at"])
+    assert md["processing_timestamp"] == out[0]["processed_at"]
+
+    stamped = p.process([{"id": 1}], now_iso="2024-01-01T00:00:00+00:00")
+    assert stamped[0]["processed_at"] == "2024-01-01T00:00:00+00:00"
+
+
+def test_generated_id_is_stable_across_key_order():
+    p = DataProcessor()
+    first = p.process([{"name": "Ana", "age": 30}])[0]["id"]
+    second = p.process([{"age": 30, "name": "Ana"}])[0]["id"]
+    assert first == second
+    assert len(first) == 32
+
+
+def test_flatten_record_keeps_key_order():
+    p = DataProcessor(flatten_lists_as_json=True)
+    record = {"a": 1, "b": {"c": 2, "d": {"e": [1, 2]}, "f": 3}, "g": 4}
+    flat = p._flatten_record(record)
+    assert list(flat) == ["a", "b_c", "b_d_e", "b_f", "g"]
+    assert json.loads(flat["b_d_e"]) == [1, 2]
+
+
+def test_lists_stay_native_for_parquet():
+    record = {"id": 1, "tags": ["a", "b"], "geo": {"points": [1, 2]}}
+    flat = DataProcessor().process([record])[0]
+    assert flat["tags"] == ["a", "b"]
+    assert flat["geo_points"] == [1, 2]
+
+    flat = DataProcessor(flatten_lists_as_json=True).process([record])[0]
+    assert flat["tags"] == '["a","b"]'
@@ -36,6 +36,15 @@ def environment_variables(monkeypatch):
     monkeypatch.setenv("LOG_LEVEL", "INFO")
 
 
+@pytest.fixture(autouse=True)
+def fresh_api_clients():
+    """Clients are cached across invocations; start each test without one."""
+    from lambdas.data_extractor.handler import _get_api_client
+    _get_api_client.cache_clear()
+    yield
+    _get_api_client.cache_clear()
+
+
 class TestLambdaHandler:
     """Test Lambda handler functionality."""
 
@@ -129,3 +138,11 @@ class TestLambdaHandler:
         assert response["statusCode"] == 500
         body = json.loads(response["body"])
         assert "Configuration error" in body["error"]
+
+
+def test_api_client_is_reused_across_invocations():
+    from lambdas.data_extractor.handler import _get_api_client
+
+    client = _get_api_client("https://api.example.com/data")
+    assert _get_api_client("https://api.example.com/data") is client
+    assert _get_api_client("https://api.example.com/data", "x-api-key", "k") is not client
@@ -1,6 +1,19 @@
 from unittest.mock import patch, MagicMock
+
+import pytest
+
+from lambdas.data_extractor import s3_writer
 from lambdas.data_extractor.s3_writer import S3Writer
 
+
+@pytest.fixture(autouse=True)
+def fresh_s3_client():
+    """The client is cached per module; let each test's boto3 patch create its own."""
+    s3_writer._S3_CLIENT = None
+    yield
+    s3_writer._S3_CLIENT = None
+
+
 @patch("lambdas.data_extractor.s3_writer.boto3")
 def test_write_data_builds_key(mock_boto):
     mock_s3 = MagicMock()
@@ -15,3 +28,108 @@ def test_write_data_builds_key(mock_boto):
     )
     assert key.startswith("raw-data/year=2024/month=01/day=01/")
     mock_s3.put_object.assert_called()
+
+@patch("lambdas.data_extractor.s3_writer.boto3")
+def test_write_parquet_falls_back_to_json_on_mixed_types(mock_boto):
+    import io
+    import pyarrow.parquet as pq
+
+    mock_s3 = MagicMock()
+    mock_boto.client.return_value = mock_s3
+    w = S3Writer("my-bucket")
+
+    key = w.write_data(data=[{"a": 1}, {"a": 2}], prefix="raw-data", format="parquet")
+    assert key.endswith(".parquet")
+    body = mock_s3.put_object.call_args_list[0].kwargs["Body"]
+    assert pq.read_table(io.BytesIO(body)).to_pylist() == [{"a": 1}, {"a": 2}]
+
+    key = w.write_data(data=[{"a": 1}, {"a": "x"}], prefix="raw-data", format="parquet")
+    assert key.endswith(".json.gz")
+
+
+@patch("lambdas.data_extractor.s3_writer.boto3")
+def test_write_parquet_keeps_list_columns(mock_boto):
+    import io
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    mock_s3 = MagicMock()
+    mock_boto.client.return_value = mock_s3
+
+    key = S3Writer("my-bucket").write_data(
+        data=[{"tags": ["a", "b"]}, {"tags": []}],
+        prefix="raw-data",
+        format="parquet"
+    )
+    assert key.endswith(".parquet")
+    table = pq.read_table(io.BytesIO(mock_s3.put_object.call_args_list[0].kwargs["Body"]))
+    assert pa.types.is_list(table.schema.field("tags").type)
+    assert table.to_pylist() == [{"tags": ["a", "b"]}, {"tags": []}]
+
+
+@patch("lambdas.data_extractor.s3_writer.boto3")
+def test_text_output_is_gzipped_and_large_payloads_use_multipart(mock_boto):
+    import gzip
+    import json
+
+    mock_s3 = MagicMock()
+    mock_boto.client.return_value = mock_s3
+    w = S3Writer("my-bucket")
+
+    key = w.write_data(data=[{"a": 1}], prefix="raw-data", format="json")
+    assert key.endswith(".json.gz")
+    call = mock_s3.put_object.call_args_list[0].kwargs
+    assert json.loads(gzip.decompress(call["Body"])) == [{"a": 1}]
+    assert call["Metadata"]["compression"] == "gzip"
+
+    with patch.object(s3_writer, "MULTIPART_THRESHOLD", 10):
+        w.write_data(data=[{"a": i} for i in range(100)], prefix="raw-data", format="csv")
+    mock_s3.upload_fileobj.assert_called_once()
+    assert mock_s3.upload_fileobj.call_args.kwargs["Key"].endswith(".csv.gz")
+    assert mock_s3.upload_fileobj.call_args.kwargs["Config"].max_concurrency == s3_writer.MULTIPART_CONCURRENCY
+
+
+@patch("lambdas.data_extractor.s3_writer.boto3")
+def test_csv_quotes_values_with_delimiters(mock_boto):
+    import csv
+    import io
+
+    body = S3Writer("my-bucket")._to_csv_simple([{"a": "x,y", "b": 'say "hi"'}, {"a": 1}])
+    rows = list(csv.reader(io.StringIO(body.decode())))
+    assert rows == [["a", "b"], ["x,y", 'say "hi"'], ["1", ""]]
+
+
+@patch("lambdas.data_extractor.s3_writer.boto3")
+def test_writers_share_one_client(mock_boto):
+    assert S3Writer("a").s3_client is S3Writer("b").s3_client
+    mock_boto.client.assert_called_once()
+
+
+@patch("lambdas.data_extractor.s3_writer.boto3")
+def test_csv_single_column_and_missing_keys(mock_boto):
+    w = S3Writer("my-bucket")
+    assert w._to_csv_simple([{"a": "xyz"}, {"a": 2}]) == b"a\nxyz\n2\n"
+    assert w._to_csv_simple([{"a": 1, "b": 2}, {"b": 3}]) == b"a,b\n1,2\n,3\n"
+    assert w._to_csv_simple([{}, {"a": 1}]) == b"\n\n\n"
+
+
+@patch("lambdas.data_extractor.s3_writer.boto3")
+def test_metadata_sidecar_only_on_request(mock_boto):
+    mock_s3 = MagicMock()
+    mock_boto.client.return_value = mock_s3
+    w = S3Writer("my-bucket")
+
+    w.write_data(data=[{"a": 1}], prefix="raw-data", format="json", metadata={"k": "v"})
+    assert mock_s3.put_object.call_count == 1
+
+    key = w.write_data(data=[{"a": 1}], prefix="raw-data", format="json", write_metadata_sidecar=True)
+    assert mock_s3.put_object.call_args.kwargs["Key"] == f"{key}.metadata.json"
+
+
+@patch("lambdas.data_extractor.s3_writer.boto3")
+def test_infer_schema_skips_leading_nulls(mock_boto):
+    schema = S3Writer("my-bucket")._infer_schema([
+        {"a": None, "b": "x", "c": None},
+        {"a": 1, "b": None, "c": None},
+    ])
+    assert schema == {"a": "int", "b": "str", "c": "NoneType"}
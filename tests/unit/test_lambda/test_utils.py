@@ -0,0 +1,35 @@
+from datetime import datetime
+
+import pytest
+
+from lambdas.data_extractor import utils
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_round_trip(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(utils, "orjson", None)
+
+    payload = {"b": [1, 2], "a": "ñ", "when": datetime(2024, 1, 1)}
+
+    encoded = utils.json_dumps(payload, sort_keys=True)
+    assert isinstance(encoded, bytes)
+    assert list(utils.json_loads(encoded)) == ["a", "b", "when"]
+    assert utils.json_loads(utils.json_dumps(payload, indent=True))["b"] == [1, 2]
+
+
+def test_stdlib_fallback_matches_orjson(monkeypatch):
+    payload = {"b": [1, 2], "a": "ñ", "when": datetime(2024, 1, 1, 12, 30, 0, 5)}
+    expected = utils.json_dumps(payload, sort_keys=True)
+
+    monkeypatch.setattr(utils, "orjson", None)
+    assert utils.json_dumps(payload, sort_keys=True) == expected
+
+
+def test_json_loads_keeps_big_integers_exact():
+    assert utils.json_loads(b'{"id": 123456789012345678901234, "n": 1.5}') == {"id": 123456789012345678901234, "n": 1.5}
+    assert utils.json_loads('[-9223372036854775809]') == [-9223372036854775809]
+
+
+def test_partition_path_uses_given_time():
+    assert utils.get_partition_path(datetime(2024, 1, 5, 23, 59)) == "year=2024/month=01/day=05"
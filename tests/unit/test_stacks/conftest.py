@@ -0,0 +1,48 @@
+"""Shared environment for the CDK stack tests."""
+
+import os
+from unittest import mock
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def base_env_profile():
+    """Canonical environment variables for building PipelineSettings."""
+    return {
+        "ENVIRONMENT": "dev",
+        "REGION": "us-east-1",
+        "ACCOUNT_ID": "123456789012",
+        "PROJECT_NAME": "data-pipeline",
+        "OWNER_TAG": "data-engineering",
+        "GLUE_DATABASE_NAME": "data_pipeline_db",
+        "GLUE_CRAWLER_NAME": "data_pipeline_crawler",
+        "CRAWLER_SCHEDULE": "cron(0 2 * * ? *)",
+        "API_ENDPOINT": "https://example.com",
+        "LAMBDA_TIMEOUT": "60",
+        "LAMBDA_MEMORY": "256",
+        "OUTPUT_FORMAT": "parquet",
+        "ENABLE_LAKE_FORMATION": "false",
+        "DATA_LAKE_ADMIN_ARN": "arn:aws:iam::123456789012:role/admin-dev-cw",
+    }
+
+
+@pytest.fixture
+def apply_env(base_env_profile):
+    """
+    Apply the profile plus overrides to ``os.environ`` in one update.
+
+    Each call snapshots the environment and it is restored after the test,
+    so calls can be stacked to change a variable mid-test.
+    """
+    patchers = []
+
+    def apply(**overrides: str) -> None:
+        patcher = mock.patch.dict(os.environ, {**base_env_profile, **overrides})
+        patcher.start()
+        patchers.append(patcher)
+
+    yield apply
+
+    for patcher in reversed(patchers):
+        patcher.stop()
@@ -1,47 +1,31 @@
-import os
 import aws_cdk as cdk
 from aws_cdk.assertions import Template, Match
 
 from infrastructure.config.settings import PipelineSettings
 from infrastructure.stacks.storage_stack import StorageStack
-from infrastructure.stacks.catalog_stack import CatalogStack
+from infrastructure.stacks.catalog_stack import CatalogStack, LakeFormationCatalogStack
 from infrastructure.stacks.compute_stack import ComputeStack
-from infrastructure.stacks.analytics_stack import AnalyticsStack
+from infrastructure.stacks.analytics_stack import AnalyticsStack, LakeFormationAnalyticsStack
 
 
-def _base_env(monkeypatch, enable_lf):
-    monkeypatch.setenv("ENVIRONMENT", "dev")
-    monkeypatch.setenv("REGION", "us-east-1")
-    monkeypatch.setenv("ACCOUNT_ID", "123456789012")
-    monkeypatch.setenv("PROJECT_NAME", "data-pipeline")
-    monkeypatch.setenv("OWNER_TAG", "data-engineering")
-    monkeypatch.setenv("GLUE_DATABASE_NAME", "data_pipeline_db")
-    monkeypatch.setenv("GLUE_CRAWLER_NAME", "data_pipeline_crawler")
-    monkeypatch.setenv("CRAWLER_SCHEDULE", "cron(0 2 * * ? *)")
-    monkeypatch.setenv("API_ENDPOINT", "https://example.com")
-    monkeypatch.setenv("LAMBDA_TIMEOUT", "60")
-    monkeypatch.setenv("LAMBDA_MEMORY", "256")
-    monkeypatch.setenv("OUTPUT_FORMAT", "parquet")
-    monkeypatch.setenv("ENABLE_LAKE_FORMATION", "true" if enable_lf else "false")
-    monkeypatch.setenv("DATA_LAKE_ADMIN_ARN", f"arn:aws:iam::{os.getenv('ACCOUNT_ID','123456789012')}:role/admin-dev-cw")
-
-
-def _mk_stacks(monkeypatch, enable_lf=False):
-    _base_env(monkeypatch, enable_lf)
+def _mk_stacks(apply_env, enable_lf=False):
+    apply_env(ENABLE_LAKE_FORMATION="true" if enable_lf else "false")
     settings = PipelineSettings()
     app = cdk.App()
     storage = StorageStack(app, "S", settings=settings)
     compute = ComputeStack(app, "C", settings=settings, storage_stack=storage)
-    catalog = CatalogStack(app, "G", settings=settings, storage_stack=storage)
-    analytics = AnalyticsStack(app, "A", settings=settings,
+    catalog_cls = LakeFormationCatalogStack if enable_lf else CatalogStack
+    analytics_cls = LakeFormationAnalyticsStack if enable_lf else AnalyticsStack
+    catalog = catalog_cls(app, "G", settings=settings, storage_stack=storage)
+    analytics = analytics_cls(app, "A", settings=settings,
                                storage_stack=storage,
                                catalog_stack=catalog,
                                compute_stack=compute)
     return analytics, settings, storage
 
 
-def test_athena_workgroup(monkeypatch):
-    analytics, settings, storage = _mk_stacks(monkeypatch, enable_lf=False)
+def test_athena_workgroup(apply_env):
+    analytics, settings, storage = _mk_stacks(apply_env, enable_lf=False)
     t = Template.from_stack(analytics)
 
     t.has_resource_properties("AWS::Athena::WorkGroup", {
@@ -57,8 +41,8 @@ def test_athena_workgroup(monkeypatch):
     })
 
 
-def test_lake_formation_resources_present_when_enabled(monkeypatch):
-    analytics, _, _ = _mk_stacks(monkeypatch, enable_lf=True)
+def test_lake_formation_resources_present_when_enabled(apply_env):
+    analytics, _, _ = _mk_stacks(apply_env, enable_lf=True)
     t = Template.from_stack(analytics)
 
     t.has_resource_properties("AWS::LakeFormation::Tag", {
@@ -1,4 +1,3 @@
-import os
 import aws_cdk as cdk
 from aws_cdk.assertions import Template, Match
 
@@ -7,32 +6,21 @@ from infrastructure.stacks.storage_stack import StorageStack
 from infrastructure.stacks.compute_stack import ComputeStack
 
 
-def _mk_settings(monkeypatch):
-    # Valid settings for ComputeStack
-    monkeypatch.setenv("ENVIRONMENT", "dev")
-    monkeypatch.setenv("REGION", "us-east-1")
-    monkeypatch.setenv("ACCOUNT_ID", "123456789012")
-    monkeypatch.setenv("PROJECT_NAME", "data-pipeline")
-    monkeypatch.setenv("OWNER_TAG", "data-engineering")
-
-    # Params for the Lambda function
-    monkeypatch.setenv("API_ENDPOINT", "https://jsonplaceholder.typicode.com/users")
-    monkeypatch.setenv("API_BATCH_SIZE", "100")
-    monkeypatch.setenv("LAMBDA_TIMEOUT", "300")
-    monkeypatch.setenv("LAMBDA_MEMORY", "1024")
-    monkeypatch.setenv("OUTPUT_FORMAT", "parquet")
-
-    # Lake Formation disabled for this test
-    monkeypatch.setenv("ENABLE_LAKE_FORMATION", "false")
-
-    acct = os.getenv("ACCOUNT_ID", "123456789012")
-    monkeypatch.setenv("DATA_LAKE_ADMIN_ARN", f"arn:aws:iam::{acct}:role/admin-dev-cw")
-
+def _mk_settings(apply_env, **overrides):
+    # Lambda parameters differ from the shared profile
+    apply_env(
+        API_ENDPOINT="https://jsonplaceholder.typicode.com/users",
+        API_BATCH_SIZE="100",
+        LAMBDA_TIMEOUT="300",
+        LAMBDA_MEMORY="1024",
+        SCHEDULE_MINUTE="0",
+        **overrides
+    )
     return PipelineSettings()
 
 
-def test_compute_stack_lambda_and_schedule(monkeypatch):
-    settings = _mk_settings(monkeypatch)
+def test_compute_stack_lambda_and_schedule(apply_env):
+    settings = _mk_settings(apply_env)
     app = cdk.App()
 
     storage = StorageStack(app, "Test-Storage", settings=settings)
@@ -44,6 +32,8 @@ def test_compute_stack_lambda_and_schedule(monkeypatch):
     t.has_resource_properties("AWS::Lambda::Function", {
         "Handler": "handler.lambda_handler",
         "Runtime": "python3.13",
+        "Architectures": ["arm64"],
+        "SnapStart": {"ApplyOn": "PublishedVersions"},
         "Environment": {
             "Variables": {
                 "DATA_BUCKET_NAME": Match.any_value(),
@@ -55,6 +45,105 @@ def test_compute_stack_lambda_and_schedule(monkeypatch):
         }
     })
 
+    t.has_resource_properties("AWS::Lambda::LayerVersion", {
+        "CompatibleRuntimes": ["python3.13"],
+        "CompatibleArchitectures": ["arm64"]
+    })
+
     t.has_resource_properties("AWS::Events::Rule", {
         "ScheduleExpression": "cron(0 */6 ? * * *)"
     })
+
+    # The schedule invokes the published alias that SnapStart applies to
+    t.has_resource_properties("AWS::Lambda::Alias", {"Name": "live"})
+
+    # Failed scheduled invocations go to a dead-letter queue
+    t.resource_count_is("AWS::SQS::Queue", 1)
+    t.has_resource_properties("AWS::Events::Rule", {
+        "Targets": [Match.object_like({"DeadLetterConfig": {"Arn": Match.any_value()}})]
+    })
+
+
+def test_api_key_parameter_attaches_extension(apply_env):
+    settings = _mk_settings(apply_env, API_KEY_PARAMETER="/data-pipeline/api-key")
+    app = cdk.App()
+
+    storage = StorageStack(app, "Test-Storage", settings=settings)
+    compute = ComputeStack(app, "Test-Compute", settings=settings, storage_stack=storage)
+
+    t = Template.from_stack(compute)
+    t.has_resource_properties("AWS::Lambda::Function", {
+        # The extension layer ARN is looked up per region
+        "Layers": Match.array_with([{"Fn::FindInMap": Match.any_value()}]),
+        "Environment": {
+            "Variables": Match.object_like({
+                "API_KEY_PARAMETER": "/data-pipeline/api-key",
+                "API_KEY_HEADER": "x-api-key",
+            })
+        }
+    })
+    t.has_resource_properties("AWS::IAM::Policy", {
+        "PolicyDocument": {
+            "Statement": Match.array_with([
+                Match.object_like({"Action": Match.array_with(["ssm:GetParameter"])})
+            ])
+        }
+    })
+
+
+def test_vpc_gets_s3_gateway_endpoint(apply_env):
+    from aws_cdk import aws_ec2 as ec2
+
+    settings = _mk_settings(apply_env)
+    app = cdk.App()
+
+    network = cdk.Stack(app, "Test-Network")
+    vpc = ec2.Vpc(network, "Vpc", max_azs=2, nat_gateways=1)
+    storage = StorageStack(app, "Test-Storage", settings=settings)
+    compute = ComputeStack(app, "Test-Compute", settings=settings, storage_stack=storage, vpc=vpc)
+
+    t = Template.from_stack(compute)
+    t.has_resource_properties("AWS::EC2::VPCEndpoint", {
+        "VpcEndpointType": "Gateway",
+        "ServiceName": Match.any_value()
+    })
+    t.has_resource_properties("AWS::Lambda::Function", {
+        "VpcConfig": Match.object_like({"SubnetIds": Match.any_value()})
+    })
+    # A passed-in role does not get VPC access from CDK; without it the function cannot be created
+    t.has_resource_properties("AWS::IAM::Role", {
+        "ManagedPolicyArns": Match.array_with([{
+            "Fn::Join": ["", [
+                "arn:",
+                {"Ref": "AWS::Partition"},
+                ":iam::aws:policy/service-role/AWSLambdaVPCAccessExecutionRole"
+            ]]
+        }])
+    })
+
+
+def test_isolated_only_vpc_uses_isolated_subnets(apply_env):
+    from aws_cdk import aws_ec2 as ec2
+
+    settings = _mk_settings(apply_env)
+    app = cdk.App()
+
+    # No NAT: the gateway endpoint is the Lambda's only route to S3
+    network = cdk.Stack(app, "Test-Network")
+    vpc = ec2.Vpc(
+        network,
+        "Vpc",
+        max_azs=2,
+        nat_gateways=0,
+        subnet_configuration=[
+            ec2.SubnetConfiguration(name="isolated", subnet_type=ec2.SubnetType.PRIVATE_ISOLATED)
+        ]
+    )
+    storage = StorageStack(app, "Test-Storage", settings=settings)
+    compute = ComputeStack(app, "Test-Compute", settings=settings, storage_stack=storage, vpc=vpc)
+
+    t = Template.from_stack(compute)
+    t.resource_count_is("AWS::EC2::VPCEndpoint", 1)
+    t.has_resource_properties("AWS::Lambda::Function", {
+        "VpcConfig": Match.object_like({"SubnetIds": Match.any_value()})
+    })
@@ -1,29 +1,77 @@
+import os
+from unittest import mock
+
 import aws_cdk as cdk
+import pytest
 from aws_cdk.assertions import Template, Match
 from infrastructure.config.settings import PipelineSettings
-from infrastructure.stacks.data_pipeline_stack import DataPipelineStack
+from infrastructure.stacks.data_pipeline_stack import DataPipelineStack, DataPipelineStage
 
 
-def test_main_stack_outputs(monkeypatch):
-    # Add environment variables needed for PipelineSettings
-    monkeypatch.setenv("ENVIRONMENT", "dev")
-    monkeypatch.setenv("REGION", "us-east-1")
-    monkeypatch.setenv("ACCOUNT_ID", "123456789012")
-    monkeypatch.setenv("PROJECT_NAME", "data-pipeline")
-    monkeypatch.setenv("OWNER_TAG", "data-engineering")
-    monkeypatch.setenv("API_ENDPOINT", "https://example.com")
-    monkeypatch.setenv("LAMBDA_TIMEOUT", "60")
-    monkeypatch.setenv("LAMBDA_MEMORY", "256")
-    monkeypatch.setenv("OUTPUT_FORMAT", "parquet")
+@pytest.fixture(scope="module")
+def main_stack(base_env_profile):
+    """One default DataPipelineStack shared by the read-only template tests."""
+    with mock.patch.dict(os.environ, base_env_profile):
+        return DataPipelineStack(cdk.App(), "Main-Stack", settings=PipelineSettings())
+
+
+def test_main_stack_outputs(main_stack):
+    t = Template.from_stack(main_stack)
+    t.has_output("ProjectName", {"Value": "data-pipeline"})
+    t.has_output("Environment", {"Value": "dev"})
+
+
+def test_nested_stacks_inherit_common_tags(main_stack):
+    t = Template.from_stack(main_stack.storage_stack)
+    t.has_resource_properties("AWS::S3::Bucket", {
+        "Tags": Match.array_with([
+            {"Key": "Project", "Value": "data-pipeline"},
+            {"Key": "Type", "Value": "DataLake"},
+        ])
+    })
+
+
+def test_outputs_skipped_when_requested(monkeypatch):
     monkeypatch.setenv("ENABLE_LAKE_FORMATION", "false")
-    monkeypatch.setenv("GLUE_DATABASE_NAME", "data_pipeline_db")
-    monkeypatch.setenv("GLUE_CRAWLER_NAME", "data_pipeline_crawler")
-    monkeypatch.setenv("CRAWLER_SCHEDULE", "cron(0 2 * * ? *)")
+    monkeypatch.setenv("SKIP_OUTPUTS", "true")
 
     settings = PipelineSettings()
     app = cdk.App()
     stack = DataPipelineStack(app, "Main-Stack", settings=settings)
 
-    t = Template.from_stack(stack)
-    t.has_output("ProjectName", {"Value": "data-pipeline"})
-    t.has_output("Environment", {"Value": "dev"})
+    assert Template.from_stack(stack).find_outputs("*") == {}
+    # Automatic cross-stack exports are still synthesized
+    assert "DataBucketName" not in Template.from_stack(stack.storage_stack).find_outputs("*")
+
+
+def test_power_tuning_stack_is_optional(monkeypatch):
+    monkeypatch.setenv("ENABLE_LAKE_FORMATION", "false")
+
+    assert DataPipelineStack(cdk.App(), "Main-Stack", settings=PipelineSettings()).power_tuning_stack is None
+
+    monkeypatch.setenv("ENABLE_POWER_TUNING", "true")
+    stack = DataPipelineStack(cdk.App(), "Main-Stack", settings=PipelineSettings())
+
+    t = Template.from_stack(stack.power_tuning_stack)
+    t.has_resource_properties("AWS::Serverless::Application", {
+        "Location": {"ApplicationId": Match.string_like_regexp("aws-lambda-power-tuning$")},
+        # Prefix match so the versions and aliases the tuner publishes are covered too
+        "Parameters": {"lambdaResource": {"Fn::Join": ["", [
+            {"Fn::ImportValue": Match.string_like_regexp("DataExtractorFunction.*Arn")},
+            "*"
+        ]]}}
+    })
+
+
+def test_stage_applies_common_tags(monkeypatch):
+    monkeypatch.setenv("PROJECT_NAME", "data-pipeline")
+    monkeypatch.setenv("ENABLE_LAKE_FORMATION", "false")
+
+    settings = PipelineSettings()
+    stage = DataPipelineStage(cdk.App(), "Stage", settings=settings)
+    stack = stage.node.find_child(f"DataPipeline-{settings.environment}")
+
+    t = Template.from_stack(stack.storage_stack)
+    t.has_resource_properties("AWS::S3::Bucket", {
+        "Tags": Match.array_with([{"Key": "Project", "Value": "data-pipeline"}])
+    })
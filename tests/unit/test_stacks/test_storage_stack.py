@@ -6,32 +6,29 @@ from infrastructure.config.settings import PipelineSettings
 from infrastructure.stacks.storage_stack import StorageStack
 
 
-class TestStorageStack:
-    """Test storage stack resources."""
+@pytest.fixture(scope="module")
+def settings():
+    """Create test settings."""
+    return PipelineSettings(
+        environment="test",
+        project_name="test-pipeline",
+        data_bucket_name="test-pipeline-data",
+        athena_results_bucket="test-pipeline-athena"
+    )
 
-    @pytest.fixture
-    def app(self):
-        """Create CDK app."""
-        return App()
 
-    @pytest.fixture
-    def settings(self):
-        """Create test settings."""
-        return PipelineSettings(
-            environment="test",
-            project_name="test-pipeline",
-            data_bucket_name="test-pipeline-data",
-            athena_results_bucket="test-pipeline-athena"
-        )
+@pytest.fixture(scope="module")
+def template(settings):
+    """Synthesize the stack once; every test only reads the template."""
+    stack = StorageStack(App(), "TestStorageStack", settings=settings)
+    return Template.from_stack(stack)
 
-    def test_s3_buckets_created(self, app, settings):
-        """Test that S3 buckets are created with correct properties."""
-        # Create stack
-        stack = StorageStack(app, "TestStorageStack", settings=settings)
 
-        # Get template
-        template = Template.from_stack(stack)
+class TestStorageStack:
+    """Test storage stack resources."""
 
+    def test_s3_buckets_created(self, template):
+        """Test that S3 buckets are created with correct properties."""
         # Assert data bucket exists
         template.resource_count_is("AWS::S3::Bucket", 2)
 
@@ -58,18 +55,18 @@ class TestStorageStack:
             }
         })
 
-    def test_lifecycle_rules(self, app, settings):
+    def test_lifecycle_rules(self, template):
         """Test that lifecycle rules are configured."""
-        stack = StorageStack(app, "TestStorageStack", settings=settings)
-        template = Template.from_stack(stack)
-
         # Check lifecycle rules
         template.has_resource_properties("AWS::S3::Bucket", {
             "LifecycleConfiguration": {
                 "Rules": Match.array_with([
                     Match.object_like({
-                        "Id": "TransitionToIA",
-                        "Status": "Enabled"
+                        "Id": "IntelligentTiering",
+                        "Status": "Enabled",
+                        "Transitions": Match.array_with([
+                            {"StorageClass": "INTELLIGENT_TIERING", "TransitionInDays": 0}
+                        ])
                     }),
                     Match.object_like({
                         "Id": "DeleteOldVersions",
@@ -79,11 +76,8 @@ class TestStorageStack:
             }
         })
 
-    def test_bucket_policy(self, app, settings):
+    def test_bucket_policy(self, template):
         """Test that bucket policy denies insecure connections."""
-        stack = StorageStack(app, "TestStorageStack", settings=settings)
-        template = Template.from_stack(stack)
-
         # Check bucket policy
         template.has_resource_properties("AWS::S3::BucketPolicy", {
             "PolicyDocument": Match.object_like({
@@ -101,11 +95,8 @@ class TestStorageStack:
             })
         })
 
-    def test_stack_outputs(self, app, settings):
+    def test_stack_outputs(self, template):
         """Test that stack outputs are created."""
-        stack = StorageStack(app, "TestStorageStack", settings=settings)
-        template = Template.from_stack(stack)
-
         # Check outputs
         template.has_output("DataBucketName", {
             "Value": Match.any_value(),